@@ -1,16 +1,21 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
-from google.oauth2 import id_token
-from google.auth.transport import requests
-from sqlmodel import Session, select
-from .database import get_session
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .database import get_async_session
 from .models import User
 from .config import settings
+from .google_keys import google_key_store
+from .cache import TTLCache
 import jwt
 from datetime import datetime, timedelta
 
 router = APIRouter()
 
+# Full User rows for endpoints that need more than the token claims
+user_cache = TTLCache(ttl=settings.USER_CACHE_TTL_SECONDS, maxsize=10000)
+
 class LoginRequest(BaseModel):
     credential: str
 
@@ -19,6 +24,11 @@ class LoginResponse(BaseModel):
     token_type: str
     user: User
 
+class TokenUser(BaseModel):
+    id: int
+    name: str
+    profile_picture: str | None = None
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -26,13 +36,22 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def create_user_token(user: User):
+    # Embed the public profile so read-only endpoints can skip the user lookup
+    return create_access_token(data={
+        "sub": str(user.id),
+        "name": user.name,
+        "picture": user.profile_picture
+    })
+
 @router.post("/login", response_model=LoginResponse)
-def login(request: LoginRequest, session: Session = Depends(get_session)):
+async def login(request: LoginRequest, session: AsyncSession = Depends(get_async_session)):
     try:
-        # Verify the Google token
-        id_info = id_token.verify_oauth2_token(
-            request.credential, 
-            requests.Request(), 
+        # Verify the Google token against the cached signing keys (a cache
+        # miss downloads certificates, so keep it off the event loop)
+        id_info = await run_in_threadpool(
+            google_key_store.verify,
+            request.credential,
             audience=settings.GOOGLE_CLIENT_ID,
             clock_skew_in_seconds=10
         )
@@ -45,15 +64,15 @@ def login(request: LoginRequest, session: Session = Depends(get_session)):
             raise HTTPException(status_code=400, detail="Invalid token: Email not found")
 
         # Check if user exists, create if not
-        user = session.exec(select(User).where(User.email == email)).first()
+        user = (await session.exec(select(User).where(User.email == email))).first()
         if not user:
             user = User(email=email, name=name, profile_picture=picture)
             session.add(user)
-            session.commit()
-            session.refresh(user)
+            await session.commit()
+            await session.refresh(user)
         
         # Create JWT token
-        access_token = create_access_token(data={"sub": str(user.id)})
+        access_token = create_user_token(user)
         
         return LoginResponse(
             access_token=access_token,
@@ -68,25 +87,54 @@ from fastapi.security import OAuth2PasswordBearer
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)):
+def decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Could not validate credentials")
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Could not validate credentials")
-    
-    user = session.get(User, int(user_id))
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
+    return payload
+
+async def load_user(session: AsyncSession, user_id: int) -> User:
+    # Database mode reads the row on every request, e.g. so a deleted user
+    # is locked out at once
+    cached = settings.AUTH_MODE != "database"
+    user = user_cache.get(user_id) if cached else None
     if user is None:
-        raise HTTPException(status_code=401, detail="User not found")
+        user = await session.get(User, user_id)
+        if user is None:
+            raise HTTPException(status_code=401, detail="User not found")
+        if cached:
+            # Cache a detached copy so it outlives this request's session
+            user = User(**user.model_dump())
+            user_cache.set(user_id, user)
     return user
 
+async def get_current_user(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_async_session)):
+    payload = decode_token(token)
+    return await load_user(session, int(payload["sub"]))
+
+async def get_token_user(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_async_session)):
+    """Identify the caller from the token claims alone (read-only endpoints)."""
+    payload = decode_token(token)
+    if settings.AUTH_MODE == "stateless" and "name" in payload:
+        return TokenUser(id=int(payload["sub"]), name=payload["name"], profile_picture=payload.get("picture"))
+
+    # Tokens issued before profile claims existed, or database mode
+    user = await load_user(session, int(payload["sub"]))
+    return TokenUser(id=user.id, name=user.name, profile_picture=user.profile_picture)
+
 @router.get("/me", response_model=LoginResponse)
-def read_users_me(current_user: User = Depends(get_current_user)):
-    access_token = create_access_token(data={"sub": str(current_user.id)})
+async def read_users_me(token: str = Depends(oauth2_scheme), current_user: User = Depends(get_current_user)):
+    # Keep the presented token until it is past half its lifetime
+    payload = decode_token(token)
+    remaining = datetime.utcfromtimestamp(payload["exp"]) - datetime.utcnow()
+    if "name" not in payload or remaining < timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES / 2):
+        token = create_user_token(current_user)
+
     return LoginResponse(
-        access_token=access_token,
+        access_token=token,
         token_type="bearer",
         user=current_user
     )
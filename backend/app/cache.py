@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from .config import settings
+
+class TTLCache:
+    """Small thread-safe in-process cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            # Drop the oldest entries once full
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+class LRUCache:
+    """Thread-safe in-process cache that evicts the least recently used entry once full."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+class RedisCache:
+    """
+    Same interface as LRUCache, backed by Redis (or anything speaking its
+    protocol) so every API process and script shares one cache. Values must
+    be bytes; eviction is left to the server's maxmemory policy plus `ttl`.
+    """
+
+    def __init__(self, url: str, namespace: str, ttl: int = 3600):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package (pip install redis)")
+        self._client = redis.Redis.from_url(url)
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(f"{self.namespace}:{key}")
+
+    def set(self, key: str, value: bytes) -> None:
+        self._client.set(f"{self.namespace}:{key}", value, ex=self.ttl)
+
+    def delete_prefix(self, prefix: str) -> None:
+        keys = list(self._client.scan_iter(match=f"{self.namespace}:{prefix}*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def clear(self) -> None:
+        self.delete_prefix("")
+
+def create_cache(namespace: str, maxsize: int):
+    """Build the cache backend selected by CACHE_BACKEND ("memory" or "redis")."""
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCache(settings.REDIS_URL, namespace)
+    return LRUCache(maxsize=maxsize)
@@ -2,9 +2,40 @@ import os
 
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL", f"postgresql://{os.environ.get('USER')}@localhost:5432/football_predictor")
+    # Async (asyncpg) URL for the API; derived from DATABASE_URL when unset
+    ASYNC_DATABASE_URL: str | None = os.getenv("ASYNC_DATABASE_URL")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
     SECRET_KEY: str = os.getenv("SECRET_KEY", "supersecretkey")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 30  # 30 days
+    # "stateless" trusts the profile claims in the JWT on read-only endpoints,
+    # "database" loads the user row on every request (no USER_CACHE_TTL_SECONDS cache)
+    AUTH_MODE: str = os.getenv("AUTH_MODE", "stateless")
+    USER_CACHE_TTL_SECONDS: int = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
     GOOGLE_CLIENT_ID: str | None = os.getenv("GOOGLE_CLIENT_ID")
+    # Google's ID token signing certificates; GOOGLE_CERTS_FILE (a local
+    # {key id: PEM} JSON file) takes precedence for offline use
+    GOOGLE_CERTS_URL: str = os.getenv("GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs")
+    GOOGLE_CERTS_FILE: str | None = os.getenv("GOOGLE_CERTS_FILE")
+    # Leaderboard grading: "standings" (materialized), "sql" (single query) or "python"
+    LEADERBOARD_ENGINE: str = os.getenv("LEADERBOARD_ENGINE", "standings")
+    # How stale the in-process week versions behind ETags may get, and the
+    # max-age clients may reuse a response for before revalidating
+    ETAG_VERSION_TTL_SECONDS: float = float(os.getenv("ETAG_VERSION_TTL_SECONDS", "5"))
+    HTTP_CACHE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MAX_AGE", "5"))
+    # Server-side response cache: "memory" (per-process LRU) or "redis"
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    LEADERBOARD_CACHE_SIZE: int = int(os.getenv("LEADERBOARD_CACHE_SIZE", "128"))
+    # Live week streams (app.live): how often watched weeks' versions are
+    # checked, and how long an idle stream waits before a keepalive
+    LIVE_POLL_SECONDS: float = float(os.getenv("LIVE_POLL_SECONDS", "2"))
+    LIVE_HEARTBEAT_SECONDS: float = float(os.getenv("LIVE_HEARTBEAT_SECONDS", "15"))
+    # Monte Carlo runs behind /leaderboard/projections
+    PROJECTION_SIMULATIONS: int = int(os.getenv("PROJECTION_SIMULATIONS", "100000"))
+    # Compressed snapshots of every scraped page (see app.page_cache)
+    PAGE_CACHE_DIR: str = os.getenv("PAGE_CACHE_DIR", os.path.join(os.path.dirname(__file__), "..", "scripts", "pages"))
 
 settings = Settings()
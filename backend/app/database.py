@@ -1,11 +1,32 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from .config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+pool_options = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+)
+
+# Sync engine for scripts and migrations
+engine = create_engine(settings.DATABASE_URL, **pool_options)
+
+# Async engine (asyncpg) for the API
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    **pool_options
+)
 
 def get_session():
     with Session(engine) as session:
         yield session
 
+async def get_async_session():
+    # expire_on_commit=False so returned objects stay readable without another round trip
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
@@ -0,0 +1,99 @@
+import json
+import re
+import threading
+import time
+from typing import Dict, Optional, Tuple
+import jwt
+import requests
+from google.auth import jwt as google_jwt
+from .config import settings
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+# Used when the response carries no usable Cache-Control (or for local key files)
+DEFAULT_MAX_AGE = 3600
+# Unknown key ids force a refetch (key rotation), but at most this often
+MIN_REFRESH_INTERVAL = 30
+
+def cache_max_age(headers) -> int:
+    match = re.search(r"max-age=(\d+)", headers.get("Cache-Control", ""))
+    if not match:
+        return DEFAULT_MAX_AGE
+    age = int(headers.get("Age", "0") or 0)
+    return max(0, int(match.group(1)) - age)
+
+class GoogleKeyStore:
+    """
+    Verifies Google ID tokens against a cached copy of Google's signing
+    certificates. Certificates are refetched only when their Cache-Control
+    max-age has passed, over a pooled HTTP session. Point certs_url at a stub
+    server, or certs_file at a local {key id: PEM certificate} JSON file, to
+    verify offline.
+    """
+
+    def __init__(self, certs_url: str, certs_file: Optional[str] = None):
+        self.certs_url = certs_url
+        self.certs_file = certs_file
+        self._http = requests.Session()
+        self._lock = threading.Lock()
+        self._certs: Optional[Dict[str, str]] = None
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+
+    def _fetch(self) -> Tuple[Dict[str, str], int]:
+        if self.certs_file:
+            with open(self.certs_file) as f:
+                return json.load(f), DEFAULT_MAX_AGE
+
+        response = self._http.get(self.certs_url, timeout=5)
+        response.raise_for_status()
+        return response.json(), cache_max_age(response.headers)
+
+    def get_certs(self, force_refresh: bool = False) -> Dict[str, str]:
+        certs = self._certs
+        if certs is not None and not force_refresh and time.monotonic() < self._expires_at:
+            return certs
+
+        with self._lock:
+            # Another thread may have refreshed while we waited
+            now = time.monotonic()
+            if self._certs is not None:
+                if not force_refresh and now < self._expires_at:
+                    return self._certs
+                if force_refresh and now - self._fetched_at < MIN_REFRESH_INTERVAL:
+                    return self._certs
+
+            try:
+                certs, max_age = self._fetch()
+            except (requests.RequestException, OSError, ValueError) as e:
+                raise ValueError(f"Could not load Google signing keys: {e}")
+
+            self._certs = certs
+            self._fetched_at = now
+            self._expires_at = now + max_age
+            return certs
+
+    def verify(self, token: str, audience: Optional[str], clock_skew_in_seconds: int = 0) -> dict:
+        """Verify a Google ID token; raises ValueError if it is not valid."""
+        try:
+            key_id = jwt.get_unverified_header(token).get("kid")
+        except jwt.PyJWTError as e:
+            raise ValueError(f"Malformed token: {e}")
+
+        certs = self.get_certs()
+        if key_id and key_id not in certs:
+            # Google rotated its keys since our copy was fetched
+            certs = self.get_certs(force_refresh=True)
+
+        id_info = google_jwt.decode(
+            token,
+            certs=certs,
+            audience=audience,
+            clock_skew_in_seconds=clock_skew_in_seconds
+        )
+
+        if id_info.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {id_info.get('iss')}")
+        return id_info
+
+google_key_store = GoogleKeyStore(settings.GOOGLE_CERTS_URL, settings.GOOGLE_CERTS_FILE)
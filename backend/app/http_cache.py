@@ -0,0 +1,32 @@
+from typing import Optional
+from fastapi import Request, Response
+from .config import settings
+
+def make_etag(*parts) -> str:
+    return 'W/"' + "-".join(str(p) for p in parts) + '"'
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" are the same representation
+    strip = lambda tag: tag.strip().removeprefix("W/")
+    return strip(etag) in {strip(tag) for tag in if_none_match.split(",")}
+
+def check_etag(request: Request, response: Response, etag: Optional[str]) -> Optional[Response]:
+    """
+    Set ETag/Cache-Control on the response and return a 304 if the client
+    already has this version. Without an etag the response is left uncached.
+    """
+    if etag is None:
+        return None
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate",
+    }
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return None
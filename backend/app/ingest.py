@@ -0,0 +1,248 @@
+import hashlib
+from datetime import timedelta
+from itertools import groupby
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo
+from sqlalchemy import DateTime, Integer, Float, and_, case, cast, column, func, values, literal, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+from .models import Game, Week
+from .versions import bump_week_version
+from .standings import update_game_result
+from .odds import record_lines
+from .teams import team_registry
+from .scoreboard import ScoreboardGame
+
+# Fields the scraper owns; scores and status belong to update_game_result
+SCRAPED_FIELDS = ("spread", "over_under", "game_time")
+
+class IngestSummary(NamedTuple):
+    inserted: int
+    updated: int
+    unchanged: int
+
+def scoreboard_rows(session: Session, parsed_games: List[ScoreboardGame]) -> Tuple[List[Dict], List[str]]:
+    """Resolve parsed scoreboard games to ingest_games rows. Also returns the team names that didn't match."""
+    rows, unknown = [], []
+    for parsed in parsed_games:
+        home_team = team_registry.by_yahoo_name(session, parsed.home_first_name, parsed.home_last_name)
+        away_team = team_registry.by_yahoo_name(session, parsed.away_first_name, parsed.away_last_name)
+        if not home_team:
+            unknown.append(f"{parsed.home_first_name} {parsed.home_last_name}")
+        if not away_team:
+            unknown.append(f"{parsed.away_first_name} {parsed.away_last_name}")
+        if not home_team or not away_team:
+            continue
+
+        rows.append({
+            "home_team_id": home_team.id,
+            "away_team_id": away_team.id,
+            # Home team's line; None until the books post one
+            "spread": parsed.spread,
+            "over_under": parsed.over_under,
+            "game_time": parsed.kickoff(),
+            "odds_source": parsed.odds_source,
+        })
+    return rows, unknown
+
+def ingest_games(session: Session, week_id: int, games: List[Dict]) -> IngestSummary:
+    """
+    Upsert a week's scraped games (dicts with home_team_id, away_team_id,
+    spread, over_under, game_time) in a single statement keyed on
+    (week_id, home_team_id, away_team_id). Existing rows are only rewritten
+    when a scraped field actually changed, and changed lines are appended
+    to the odds history. Lines only move while a game is scheduled and one
+    is posted; after kickoff a line change has to go through
+    update_game_result, which regrades. The caller commits.
+    """
+    # One row per matchup; ON CONFLICT can't touch the same row twice
+    games = list({(g["home_team_id"], g["away_team_id"]): g for g in games}.values())
+    if not games:
+        return IngestSummary(0, 0, 0)
+
+    rows = values(
+        column("home_team_id", Integer),
+        column("away_team_id", Integer),
+        column("spread", Float),
+        column("over_under", Float),
+        column("game_time", DateTime(timezone=True)),
+        name="scraped"
+    ).data([
+        (g["home_team_id"], g["away_team_id"], g["spread"], g["over_under"], g["game_time"])
+        for g in games
+    ])
+    # A line or kickoff that vanished from the page keeps the stored one (0
+    # until the books post a line). Casts, because Postgres types an
+    # all-NULL VALUES column as text
+    existing = aliased(Game)
+    insert_stmt = insert(Game).from_select(
+        ["week_id", "home_team_id", "away_team_id", "spread", "over_under", "game_time", "status"],
+        select(
+            literal(week_id), rows.c.home_team_id, rows.c.away_team_id,
+            func.coalesce(cast(rows.c.spread, Float), existing.spread, 0.0),
+            func.coalesce(cast(rows.c.over_under, Float), existing.over_under),
+            func.coalesce(cast(rows.c.game_time, DateTime(timezone=True)), existing.game_time),
+            literal("scheduled")
+        ).select_from(rows).outerjoin(existing, and_(
+            existing.week_id == week_id,
+            existing.home_team_id == rows.c.home_team_id,
+            existing.away_team_id == rows.c.away_team_id
+        ))
+    )
+    excluded = insert_stmt.excluded
+    table = Game.__table__.c
+    # Lines only move until a game is graded (apply_scores runs after
+    # this), so no standing was ever counted against the old line. Checked
+    # on the locked row, in case it was graded since the select above
+    scheduled = table.status == "scheduled"
+    updates = {
+        "spread": case((scheduled, excluded.spread), else_=table.spread),
+        "over_under": case((scheduled, excluded.over_under), else_=table.over_under),
+        # A page without a kickoff keeps the stored one (pick locking reads it)
+        "game_time": func.coalesce(excluded.game_time, table.game_time),
+    }
+    upsert = insert_stmt.on_conflict_do_update(
+        constraint="uq_game_week_id_home_team_id_away_team_id",
+        set_=updates,
+        where=tuple_(*(table[f] for f in SCRAPED_FIELDS)).is_distinct_from(
+            tuple_(*(updates[f] for f in SCRAPED_FIELDS))
+        )
+    # xmax is 0 only for freshly inserted rows
+    ).returning(Game.id, Game.home_team_id, Game.away_team_id, Game.spread, Game.over_under, literal_column("xmax = 0"))
+
+    written = session.execute(upsert).all()
+    inserted = sum(1 for *_, is_insert in written if is_insert)
+    updated = len(written) - inserted
+    if written:
+        bump_week_version(session, week_id)
+
+    # Only games with a posted line have history; the written line is
+    # recorded (not the scraped one, which started games ignore) and
+    # record_lines skips repeats
+    by_matchup = {(g["home_team_id"], g["away_team_id"]): g for g in games}
+    record_lines(session, [
+        (game_id, spread, over_under, g["odds_source"])
+        for game_id, home_team_id, away_team_id, spread, over_under, _ in written
+        for g in [by_matchup[(home_team_id, away_team_id)]]
+        if g.get("odds_source") is not None
+    ])
+    return IngestSummary(inserted, updated, len(games) - len(written))
+
+def week_dates(parsed_games: List[ScoreboardGame]) -> Optional[Tuple[str, str]]:
+    """Tuesday-to-Monday date range (US Eastern) containing the week's kickoffs."""
+    kickoffs = [g.kickoff() for g in parsed_games]
+    kickoffs = [k.astimezone(ZoneInfo("America/New_York")).date() for k in kickoffs if k is not None]
+    if not kickoffs:
+        return None
+    first = min(kickoffs)
+    start = first - timedelta(days=(first.weekday() - 1) % 7)
+    return start.isoformat(), (start + timedelta(days=6)).isoformat()
+
+def get_or_create_week(session: Session, season: int, week_number: int, parsed_games: List[ScoreboardGame]) -> Week:
+    week = session.exec(select(Week).where(Week.season == season, Week.week_number == week_number)).first()
+    if week:
+        return week
+
+    dates = week_dates(parsed_games) or ("", "")
+    week = Week(season=season, week_number=week_number, start_date=dates[0], end_date=dates[1])
+    session.add(week)
+    session.flush()
+    return week
+
+def ingest_scoreboard(
+    session: Session, parsed_games: List[ScoreboardGame]
+) -> Tuple[Dict[Tuple[int, int], IngestSummary], List[str]]:
+    """
+    Ingest parsed scoreboard games into the (season, week) Yahoo reports for
+    them, creating weeks as needed. Returns a summary per week and the team
+    names that weren't found. The caller commits.
+    """
+    by_week = lambda g: (g.season or 0, g.week_number or 0)
+    summaries, unknown = {}, []
+    for (season, week_number), week_games in groupby(sorted(parsed_games, key=by_week), key=by_week):
+        week_games = list(week_games)
+        if not season or not week_number:
+            continue
+        week = get_or_create_week(session, season, week_number, week_games)
+        rows, missing = scoreboard_rows(session, week_games)
+        unknown.extend(missing)
+        summaries[(season, week_number)] = ingest_games(session, week.id, rows)
+    return summaries, unknown
+
+def apply_scores(session: Session, parsed_games: List[ScoreboardGame]) -> int:
+    """
+    Apply score/status changes from parsed games to existing Game rows via
+    update_game_result (standings, versions, caches). Games that aren't in
+    the database yet are skipped. The caller commits. Returns the number of
+    games changed.
+    """
+    seasons = {g.season for g in parsed_games}
+    weeks = session.exec(select(Week).where(Week.season.in_(seasons))).all()
+    week_ids = {(w.season, w.week_number): w.id for w in weeks}
+
+    db_games = session.exec(select(Game).where(Game.week_id.in_(week_ids.values()))).all()
+    game_map = {(g.week_id, g.home_team_id, g.away_team_id): g for g in db_games}
+
+    updates = {}
+    for parsed in parsed_games:
+        week_id = week_ids.get((parsed.season, parsed.week_number))
+        home_team = team_registry.by_yahoo_name(session, parsed.home_first_name, parsed.home_last_name)
+        away_team = team_registry.by_yahoo_name(session, parsed.away_first_name, parsed.away_last_name)
+        if week_id is None or not home_team or not away_team:
+            continue
+        game = game_map.get((week_id, home_team.id, away_team.id))
+        if game is None:
+            continue
+
+        new_values = (parsed.home_score, parsed.away_score, parsed.status)
+        if (game.home_score, game.away_score, game.status) != new_values:
+            updates[game.id] = new_values
+    if not updates:
+        return 0
+
+    # Lock and re-read the games about to change (in id order, so concurrent
+    # writers can't deadlock). Another process may have applied the same
+    # result since they were read above; grading it twice would double-count
+    locked = session.exec(
+        select(Game)
+        .where(Game.id.in_(updates.keys()))
+        .order_by(Game.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).all()
+    changed = 0
+    for game in locked:
+        new_values = updates[game.id]
+        if (game.home_score, game.away_score, game.status) == new_values:
+            continue
+        update_game_result(session, game, *new_values)
+        changed += 1
+    return changed
+
+def game_fingerprint(parsed: ScoreboardGame) -> str:
+    """Hash of the fields that change over a game's life (line, total, kickoff, score, status)."""
+    fields = (parsed.spread, parsed.over_under, parsed.start_time, parsed.home_score, parsed.away_score, parsed.status)
+    return hashlib.blake2b(repr(fields).encode(), digest_size=8).hexdigest()
+
+class ChangeTracker:
+    """
+    Remembers the last page hash and each game's fingerprint as of the last
+    successful write, so a polling loop can skip parsing unchanged pages and
+    only write (and invalidate caches for) games that actually changed.
+    """
+
+    def __init__(self):
+        self.page_sha256: Optional[str] = None
+        self.fingerprints: Dict[str, str] = {}
+
+    def page_changed(self, sha256: str) -> bool:
+        return sha256 != self.page_sha256
+
+    def changed_games(self, parsed_games: List[ScoreboardGame]) -> List[ScoreboardGame]:
+        return [g for g in parsed_games if self.fingerprints.get(g.yahoo_id) != game_fingerprint(g)]
+
+    def mark_written(self, sha256: str, parsed_games: List[ScoreboardGame]) -> None:
+        self.page_sha256 = sha256
+        for game in parsed_games:
+            self.fingerprints[game.yahoo_id] = game_fingerprint(game)
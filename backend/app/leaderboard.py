@@ -1,12 +1,29 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import Session, select, func
-from typing import List
-from pydantic import BaseModel
-from .database import get_session
-from .models import User, Pick, Game, Week
+import base64
+import json
+from bisect import bisect_right
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlmodel import Session, select, func, case, cast, Float, Numeric
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel, TypeAdapter
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .database import get_async_session
+from .config import settings
+from .versions import data_versions
+from .http_cache import make_etag, check_etag
+from .cache import LRUCache, create_cache
+from .auth import TokenUser, get_token_user
+from .models import User, Pick, Game, Week, Standing
 
 router = APIRouter()
 
+# Serialized leaderboard JSON keyed by "<week_id, season-N or all>:<data
+# version>", so writes from other processes (scraper, scripts) miss naturally
+# once the version moves on. invalidate_leaderboards() drops a week's entries
+# eagerly.
+leaderboard_cache = create_cache("leaderboard", settings.LEADERBOARD_CACHE_SIZE)
+# RankedBoards for paging and "my rank", under the same keys (in-process only)
+ranked_boards = LRUCache(settings.LEADERBOARD_CACHE_SIZE)
+
 class LeaderboardEntry(BaseModel):
     rank: int
     user_id: int
@@ -16,12 +33,215 @@ class LeaderboardEntry(BaseModel):
     total_picks: int
     win_rate: float
 
+entries_adapter = TypeAdapter(List[LeaderboardEntry])
+
+def invalidate_leaderboards(week_id: int | None = None) -> None:
+    """Drop cached leaderboards for a week (and the season-wide one), or everything."""
+    for cache in (leaderboard_cache, ranked_boards):
+        if week_id is None:
+            cache.clear()
+            continue
+        cache.delete_prefix(f"{week_id}:")
+        cache.delete_prefix("season-")
+        cache.delete_prefix("all:")
+
+def build_entry(user_id: int, user_name: str, profile_picture: str | None, correct: int, total: int) -> LeaderboardEntry:
+    win_rate = (correct / total) * 100 if total > 0 else 0.0
+    return LeaderboardEntry(
+        rank=0, # Placeholder
+        user_id=user_id,
+        user_name=user_name,
+        profile_picture=profile_picture,
+        correct_picks=correct,
+        total_picks=total,
+        win_rate=round(win_rate, 1)
+    )
+
+def score_key(correct: int, total: int) -> Tuple[int, float]:
+    # Correct picks (desc), then win rate (desc). The exact rate rather than
+    # the rounded win_rate, so every engine agrees on ties
+    return (-correct, -(correct / total if total else 0.0))
+
+def sort_key(entry: LeaderboardEntry) -> Tuple[int, float, int]:
+    # Ties are listed by user id, which makes the order total for cursors
+    return score_key(entry.correct_picks, entry.total_picks) + (entry.user_id,)
+
+def competition_ranks(scores: List[Tuple[int, float]]) -> List[int]:
+    # Ranks for sorted score keys: tied users share a rank and the next rank
+    # skips (1, 1, 3)
+    ranks = []
+    for i, score in enumerate(scores):
+        ranks.append(ranks[-1] if i and score == scores[i - 1] else i + 1)
+    return ranks
+
+def rank_entries(leaderboard: List[LeaderboardEntry]) -> List[LeaderboardEntry]:
+    leaderboard.sort(key=sort_key)
+    ranks = competition_ranks([score_key(e.correct_picks, e.total_picks) for e in leaderboard])
+    for entry, rank in zip(leaderboard, ranks):
+        entry.rank = rank
+    return leaderboard
+
+class RankedBoard:
+    """
+    A ranked leaderboard indexed by user id and sort key, so a page after a
+    cursor is a bisect plus a slice and "my rank" is a dict lookup, without
+    serializing the whole board.
+    """
+
+    def __init__(self, entries: List[LeaderboardEntry]):
+        self.entries = entries
+        self.keys = [sort_key(e) for e in entries]
+        self.positions: Dict[int, int] = {e.user_id: i for i, e in enumerate(entries)}
+
+    def page(self, limit: int, after: Optional[Tuple[int, float, int]] = None) -> Tuple[List[LeaderboardEntry], Optional[Tuple[int, float, int]]]:
+        # Keyset pagination: resume after the last key seen, so pages stay
+        # consistent when the board is rebuilt between requests
+        start = bisect_right(self.keys, after) if after else 0
+        entries = self.entries[start:start + limit]
+        has_more = start + limit < len(self.entries)
+        return entries, (self.keys[start + limit - 1] if has_more else None)
+
+    def entry_for(self, user_id: int) -> Optional[LeaderboardEntry]:
+        position = self.positions.get(user_id)
+        return None if position is None else self.entries[position]
+
+def encode_cursor(key: Tuple[int, float, int]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[int, float, int]:
+    try:
+        correct, rate, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (int(correct), float(rate), int(user_id))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+class LeaderboardPage(BaseModel):
+    entries: List[LeaderboardEntry]
+    next_cursor: Optional[str] = None
+    # Number of ranked users on the whole board
+    total: int
+    # The caller's own entry, wherever it falls
+    me: Optional[LeaderboardEntry] = None
+
+def leaderboard_scope(versions, week_id: int | None, season: int | None) -> Tuple[Optional[str], Optional[str]]:
+    """ETag and cache key for a leaderboard, or (None, None) for a week without a version."""
+    if week_id:
+        version = versions.week_version(week_id)
+        if version is None:
+            return None, None
+        return make_etag("leaderboard", week_id, version), f"{week_id}:{version}"
+    if season:
+        # Every week's version feeds the global one, so it covers the season
+        return make_etag("leaderboard", "season", season, versions.global_version), f"season-{season}:{versions.global_version}"
+    return make_etag("leaderboard", "all", versions.global_version), f"all:{versions.global_version}"
+
+async def leaderboard_content(session: AsyncSession, week_id: int | None, season: int | None, cache_key: Optional[str]) -> bytes:
+    content = leaderboard_cache.get(cache_key) if cache_key else None
+    if content is None:
+        # Reuse a ranked board built for /leaderboard/page before recomputing
+        board = ranked_boards.get(cache_key) if cache_key else None
+        entries = board.entries if board else await session.run_sync(leaderboard_builder(), week_id=week_id, season=season)
+        content = entries_adapter.dump_json(entries)
+        if cache_key:
+            leaderboard_cache.set(cache_key, content)
+    return content
+
+async def ranked_board(session: AsyncSession, week_id: int | None, season: int | None, cache_key: Optional[str]) -> RankedBoard:
+    board = ranked_boards.get(cache_key) if cache_key else None
+    if board is None:
+        # Straight from the engine; only /leaderboard/ needs the JSON
+        board = RankedBoard(await session.run_sync(leaderboard_builder(), week_id=week_id, season=season))
+        if cache_key:
+            ranked_boards.set(cache_key, board)
+    return board
+
 @router.get("/", response_model=List[LeaderboardEntry])
-def get_leaderboard(week_id: int | None = None, session: Session = Depends(get_session)):
+async def get_leaderboard(
+    request: Request,
+    response: Response,
+    week_id: int | None = None,
+    season: int | None = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    versions = await data_versions.snapshot(session)
+    etag, cache_key = leaderboard_scope(versions, week_id, season)
+    not_modified = check_etag(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    content = await leaderboard_content(session, week_id, season, cache_key)
+    # Already serialized, so skip response_model validation
+    return Response(content=content, media_type="application/json", headers=dict(response.headers))
+
+@router.get("/page", response_model=LeaderboardPage)
+async def get_leaderboard_page(
+    limit: int = Query(25, ge=1, le=100),
+    cursor: str | None = None,
+    week_id: int | None = None,
+    season: int | None = None,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: TokenUser = Depends(get_token_user)
+):
+    after = decode_cursor(cursor) if cursor else None
+    versions = await data_versions.snapshot(session)
+    _, cache_key = leaderboard_scope(versions, week_id, season)
+    board = await ranked_board(session, week_id, season, cache_key)
+
+    entries, last_key = board.page(limit, after)
+    return LeaderboardPage(
+        entries=entries,
+        next_cursor=encode_cursor(last_key) if last_key else None,
+        total=len(board.entries),
+        me=board.entry_for(current_user.id)
+    )
+
+def leaderboard_builder():
+    # The engines are plain Session functions shared with the scripts; run_sync
+    # executes them on the async connection without a worker thread
+    if settings.LEADERBOARD_ENGINE == "sql":
+        return compute_leaderboard_sql
+    elif settings.LEADERBOARD_ENGINE == "python":
+        return compute_leaderboard
+    return read_standings_leaderboard
+
+def read_standings_leaderboard(session: Session, week_id: int | None = None, season: int | None = None) -> List[LeaderboardEntry]:
+    # Standings are maintained incrementally by app.standings, so this is a
+    # single aggregate over the (user, week) rows.
+    correct = func.sum(Standing.correct)
+    total = func.sum(Standing.total)
+    query = (
+        select(User.id, User.name, User.profile_picture, correct, total)
+        .select_from(Standing)
+        .join(User, User.id == Standing.user_id)
+        .group_by(User.id)
+        .having(total + func.sum(Standing.pushes) > 0)
+    )
+    if week_id:
+        query = query.where(Standing.week_id == week_id)
+    elif season:
+        query = query.join(Week, Week.id == Standing.week_id).where(Week.season == season)
+
+    rows = session.exec(query).all()
+    return rank_entries([build_entry(*row) for row in rows])
+
+def spread_winner(game: Game, spread: float) -> int | None:
+    # Spread logic (Home + Spread vs Away)
+    # Example: Home -3.5. Home 20, Away 10. 20 + (-3.5) = 16.5 > 10. Home Wins.
+    adjusted_home_score = game.home_score + spread
+    if adjusted_home_score > game.away_score:
+        return game.home_team_id
+    elif adjusted_home_score < game.away_score:
+        return game.away_team_id
+    return None # Push
+
+def compute_leaderboard(session: Session, week_id: int | None = None, season: int | None = None) -> List[LeaderboardEntry]:
+    """Grade the leaderboard straight from games and picks (used to verify the standings)."""
     # Get all completed games
     query = select(Game).where(Game.status == "final")
     if week_id:
         query = query.where(Game.week_id == week_id)
+    elif season:
+        query = query.join(Week, Week.id == Game.week_id).where(Week.season == season)
     
     completed_games = session.exec(query).all()
     game_map = {g.id: g for g in completed_games}
@@ -35,16 +255,7 @@ def get_leaderboard(week_id: int | None = None, session: Session = Depends(get_s
         if game.home_score is None or game.away_score is None:
             continue
             
-        # Spread logic (Home + Spread vs Away)
-        # Example: Home -3.5. Home 20, Away 10. 20 + (-3.5) = 16.5 > 10. Home Wins.
-        adjusted_home_score = game.home_score + game.spread
-        
-        if adjusted_home_score > game.away_score:
-            game_winners[game.id] = game.home_team_id
-        elif adjusted_home_score < game.away_score:
-            game_winners[game.id] = game.away_team_id
-        else:
-            game_winners[game.id] = None # Push
+        game_winners[game.id] = spread_winner(game, game.spread)
 
     # Get all picks for these games
     picks_query = select(Pick).where(Pick.game_id.in_(game_winners.keys()))
@@ -58,6 +269,9 @@ def get_leaderboard(week_id: int | None = None, session: Session = Depends(get_s
             user_scores[pick.user_id] = {"correct": 0, "total": 0}
         
         winner_id = game_winners.get(pick.game_id)
+        if pick.spread is not None:
+            # Graded against the line locked in when the pick was made
+            winner_id = spread_winner(game_map[pick.game_id], pick.spread)
         if winner_id is not None:
             user_scores[pick.user_id]["total"] += 1
             if pick.selected_team_id == winner_id:
@@ -74,23 +288,79 @@ def get_leaderboard(week_id: int | None = None, session: Session = Depends(get_s
         if not user:
             continue
             
-        win_rate = (score["correct"] / score["total"]) * 100 if score["total"] > 0 else 0.0
-        
-        leaderboard.append(LeaderboardEntry(
-            rank=0, # Placeholder
-            user_id=user.id,
-            user_name=user.name,
-            profile_picture=user.profile_picture,
-            correct_picks=score["correct"],
-            total_picks=score["total"],
-            win_rate=round(win_rate, 1)
+        leaderboard.append(build_entry(
+            user.id, user.name, user.profile_picture, score["correct"], score["total"]
         ))
-    
-    # Sort by correct picks (desc), then win rate (desc)
-    leaderboard.sort(key=lambda x: (x.correct_picks, x.win_rate), reverse=True)
-    
-    # Assign ranks
-    for i, entry in enumerate(leaderboard):
-        entry.rank = i + 1
-        
-    return leaderboard
+
+    return rank_entries(leaderboard)
+
+def build_leaderboard_query(week_id: int | None = None, season: int | None = None):
+    # Spread winner per graded pick (Home + Spread vs Away), NULL for a push.
+    # Picks carry the line they were made at; older picks use the game's line
+    adjusted_home_score = Game.home_score + func.coalesce(Pick.spread, Game.spread)
+    winner_id = case(
+        (adjusted_home_score > Game.away_score, Game.home_team_id),
+        (adjusted_home_score < Game.away_score, Game.away_team_id),
+        else_=None
+    )
+    graded = (
+        select(Pick.user_id, Pick.selected_team_id, winner_id.label("winner_id"))
+        .join(Game, Game.id == Pick.game_id)
+        .where(Game.status == "final")
+        .where(Game.home_score.is_not(None))
+        .where(Game.away_score.is_not(None))
+    )
+    if week_id:
+        graded = graded.where(Game.week_id == week_id)
+    elif season:
+        graded = graded.join(Week, Week.id == Game.week_id).where(Week.season == season)
+    graded = graded.cte("graded")
+
+    # Pushes are included (so the user still appears) but count towards neither total
+    scores = (
+        select(
+            graded.c.user_id.label("user_id"),
+            func.count().filter(graded.c.selected_team_id == graded.c.winner_id).label("correct"),
+            func.count(graded.c.winner_id).label("total")
+        )
+        .group_by(graded.c.user_id)
+        .cte("scores")
+    )
+
+    win_rate = cast(case(
+        (scores.c.total > 0, func.round(cast(scores.c.correct * 100, Numeric) / scores.c.total, 1)),
+        else_=0.0
+    ), Float)
+    # Competition ranking on the exact rate, matching rank_entries
+    exact_rate = case((scores.c.total > 0, cast(scores.c.correct, Float) / scores.c.total), else_=0.0)
+    rank = func.rank().over(order_by=(scores.c.correct.desc(), exact_rate.desc()))
+
+    return (
+        select(
+            rank.label("rank"),
+            User.id,
+            User.name,
+            User.profile_picture,
+            scores.c.correct,
+            scores.c.total,
+            win_rate.label("win_rate")
+        )
+        .join(User, User.id == scores.c.user_id)
+        .order_by(rank, User.id)
+    )
+
+def compute_leaderboard_sql(session: Session, week_id: int | None = None, season: int | None = None) -> List[LeaderboardEntry]:
+    """Grade, aggregate and rank the leaderboard in a single database round trip."""
+    rows = session.exec(build_leaderboard_query(week_id, season)).all()
+    return [
+        LeaderboardEntry(
+            rank=row.rank,
+            user_id=row.id,
+            user_name=row.name,
+            profile_picture=row.profile_picture,
+            correct_picks=row.correct,
+            total_picks=row.total,
+            win_rate=row.win_rate
+        )
+        for row in rows
+    ]
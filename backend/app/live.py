@@ -0,0 +1,193 @@
+import asyncio
+import json
+from typing import Dict, List, NamedTuple, Optional, Set
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .config import settings
+from .database import async_engine, get_async_session
+from .leaderboard import LeaderboardEntry, leaderboard_builder
+from .models import Game, Week
+
+router = APIRouter()
+
+class GameState(NamedTuple):
+    home_score: Optional[int]
+    away_score: Optional[int]
+    status: str
+    spread: float
+
+class RankState(NamedTuple):
+    rank: int
+    correct_picks: int
+    total_picks: int
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+class WeekChannel:
+    def __init__(self, week_id: int):
+        self.week_id = week_id
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.version: Optional[int] = None
+        self.games: Dict[int, GameState] = {}
+        self.ranks: Dict[int, RankState] = {}
+        self.entries: List[LeaderboardEntry] = []
+
+    def snapshot_event(self) -> str:
+        return sse_event("snapshot", {
+            "week_id": self.week_id,
+            "version": self.version,
+            "games": [{"id": game_id, **state._asdict()} for game_id, state in self.games.items()],
+            "leaderboard": [entry.model_dump() for entry in self.entries],
+        })
+
+class LiveBroadcaster:
+    """
+    Fans out one week's score/status and leaderboard changes to every open
+    stream in this process. Writes come from other processes (scraper,
+    live_scores.py), so a single task polls the data_version of every week
+    with subscribers; when one moves, its games and leaderboard are loaded
+    and diffed once and the encoded event is queued for each subscriber.
+    """
+
+    def __init__(self, poll_interval: float, queue_size: int = 64):
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.channels: Dict[int, WeekChannel] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def _load(self, session: AsyncSession, channel: WeekChannel) -> List[str]:
+        """Reload a week's state and return the events describing what changed."""
+        rows = (await session.exec(
+            select(Game.id, Game.home_score, Game.away_score, Game.status, Game.spread)
+            .where(Game.week_id == channel.week_id)
+            .order_by(Game.id)
+        )).all()
+        games = {game_id: GameState(*state) for game_id, *state in rows}
+        entries = await session.run_sync(leaderboard_builder(), week_id=channel.week_id)
+        ranks = {e.user_id: RankState(e.rank, e.correct_picks, e.total_picks) for e in entries}
+
+        events = []
+        game_changes = [
+            {"id": game_id, **state._asdict()}
+            for game_id, state in games.items()
+            if channel.games.get(game_id) != state
+        ]
+        if game_changes:
+            events.append(sse_event("games", {"version": channel.version, "games": game_changes}))
+
+        rank_changes = [
+            {
+                "user_id": entry.user_id,
+                "user_name": entry.user_name,
+                "rank": entry.rank,
+                "previous_rank": channel.ranks[entry.user_id].rank if entry.user_id in channel.ranks else None,
+                "correct_picks": entry.correct_picks,
+                "total_picks": entry.total_picks,
+                "win_rate": entry.win_rate,
+            }
+            for entry in entries
+            if channel.ranks.get(entry.user_id) != ranks[entry.user_id]
+        ]
+        if rank_changes:
+            events.append(sse_event("ranks", {"version": channel.version, "ranks": rank_changes}))
+
+        channel.games, channel.ranks, channel.entries = games, ranks, entries
+        return events
+
+    def publish(self, channel: WeekChannel, event: str) -> None:
+        for queue in list(channel.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A subscriber this far behind is dropped; its stream ends
+                # and the client reconnects for a fresh snapshot
+                channel.subscribers.discard(queue)
+
+    async def poll_once(self) -> None:
+        week_ids = list(self.channels)
+        if not week_ids:
+            return
+        async with AsyncSession(async_engine) as session:
+            rows = (await session.exec(select(Week.id, Week.data_version).where(Week.id.in_(week_ids)))).all()
+            for week_id, version in rows:
+                channel = self.channels.get(week_id)
+                if channel is None or channel.version == version:
+                    continue
+                channel.version = version
+                for event in await self._load(session, channel):
+                    self.publish(channel, event)
+
+    async def _run(self) -> None:
+        while self.channels:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll_once()
+            except Exception as e:
+                # Keep streaming through a transient database error
+                print(f"Live poll failed: {e}")
+
+    async def subscribe(self, session: AsyncSession, week_id: int) -> asyncio.Queue:
+        channel = self.channels.get(week_id)
+        if channel is None:
+            channel = WeekChannel(week_id)
+            channel.version = (await session.exec(select(Week.data_version).where(Week.id == week_id))).first()
+            await self._load(session, channel)
+            # Another subscriber may have opened the channel meanwhile
+            channel = self.channels.setdefault(week_id, channel)
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        queue.put_nowait(channel.snapshot_event())
+        channel.subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def is_subscribed(self, week_id: int, queue: asyncio.Queue) -> bool:
+        channel = self.channels.get(week_id)
+        return channel is not None and queue in channel.subscribers
+
+    def unsubscribe(self, week_id: int, queue: asyncio.Queue) -> None:
+        channel = self.channels.get(week_id)
+        if channel is None:
+            return
+        channel.subscribers.discard(queue)
+        if not channel.subscribers:
+            # Nobody is watching: stop polling the week
+            del self.channels[week_id]
+
+live_broadcaster = LiveBroadcaster(poll_interval=settings.LIVE_POLL_SECONDS)
+
+@router.get("/{week_id}/live")
+async def stream_week(week_id: int, request: Request, session: AsyncSession = Depends(get_async_session)):
+    """
+    Server-Sent Events for a week: a "snapshot" event with its games and
+    leaderboard, then "games" (score/status/spread) and "ranks" deltas as
+    they are written.
+    """
+    if not await session.get(Week, week_id):
+        raise HTTPException(status_code=404, detail="Week not found")
+    queue = await live_broadcaster.subscribe(session, week_id)
+    # Don't hold a pooled connection for the life of the stream
+    await session.close()
+
+    async def events():
+        try:
+            while live_broadcaster.is_subscribed(week_id, queue) or not queue.empty():
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=settings.LIVE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    # Comment line that keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+        finally:
+            live_broadcaster.unsubscribe(week_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
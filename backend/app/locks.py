@@ -0,0 +1,96 @@
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, List, NamedTuple, Optional
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .models import Game
+from .versions import data_versions
+
+class WeekKickoffs(NamedTuple):
+    week_id: int
+    version: Optional[int]
+    # Scheduled games with a kickoff, sorted by kickoff
+    kickoffs: List[datetime]
+    kickoff_game_ids: List[int]
+    # Scheduled games without a kickoff stay open until they get one
+    untimed_game_ids: List[int]
+    # Every game in the week -> its kickoff
+    games: Dict[int, Optional[datetime]]
+    # Games no longer scheduled (in progress or final)
+    started: FrozenSet[int]
+
+    def is_locked(self, game_id: int, now: datetime) -> bool:
+        if game_id in self.started:
+            return True
+        kickoff = self.games.get(game_id)
+        return kickoff is not None and now >= kickoff
+
+    def open_game_ids(self, now: datetime) -> List[int]:
+        # Everything after the last kickoff <= now is still open
+        return self.untimed_game_ids + self.kickoff_game_ids[bisect_right(self.kickoffs, now):]
+
+class KickoffIndex:
+    """
+    Process-wide, per-week sorted index of kickoff times, so pick locking and
+    "which games are still open" are answered without a query or any date
+    parsing. A week is rebuilt when its data_version moves (status and
+    kickoff changes bump it), so it is at most ETAG_VERSION_TTL_SECONDS
+    stale; upsert_picks still enforces the lock in SQL.
+    """
+
+    def __init__(self):
+        self._weeks: Dict[int, WeekKickoffs] = {}
+        self._game_weeks: Dict[int, int] = {}
+
+    async def _load_week(self, session: AsyncSession, week_id: int, version: Optional[int]) -> WeekKickoffs:
+        rows = (await session.exec(
+            select(Game.id, Game.status, Game.game_time).where(Game.week_id == week_id)
+        )).all()
+
+        timed = sorted((kickoff, game_id) for game_id, status, kickoff in rows if status == "scheduled" and kickoff)
+        week = WeekKickoffs(
+            week_id=week_id,
+            version=version,
+            kickoffs=[kickoff for kickoff, _ in timed],
+            kickoff_game_ids=[game_id for _, game_id in timed],
+            untimed_game_ids=sorted(game_id for game_id, status, kickoff in rows if status == "scheduled" and not kickoff),
+            games={game_id: kickoff for game_id, _, kickoff in rows},
+            started=frozenset(game_id for game_id, status, _ in rows if status != "scheduled"),
+        )
+        self._weeks[week_id] = week
+        self._game_weeks.update((game_id, week_id) for game_id in week.games)
+        return week
+
+    async def week(self, session: AsyncSession, week_id: int, refresh: bool = False) -> WeekKickoffs:
+        version = (await data_versions.snapshot(session)).week_version(week_id)
+        week = self._weeks.get(week_id)
+        if refresh or week is None or week.version != version:
+            week = await self._load_week(session, week_id, version)
+        return week
+
+    async def week_for_game(self, session: AsyncSession, game_id: int) -> Optional[WeekKickoffs]:
+        """The indexed week containing a game, or None if the game doesn't exist."""
+        week_id = self._game_weeks.get(game_id)
+        if week_id is not None:
+            week = await self.week(session, week_id)
+            if game_id in week.games:
+                return week
+
+        # A game we haven't indexed yet (or that moved weeks)
+        week_id = (await session.exec(select(Game.week_id).where(Game.id == game_id))).first()
+        if week_id is None:
+            return None
+        return await self.week(session, week_id, refresh=True)
+
+    async def is_locked(self, session: AsyncSession, game_id: int, now: Optional[datetime] = None) -> Optional[bool]:
+        """Whether picks on a game are locked, or None if the game doesn't exist."""
+        week = await self.week_for_game(session, game_id)
+        if week is None:
+            return None
+        return week.is_locked(game_id, now or datetime.now(timezone.utc))
+
+    def invalidate(self) -> None:
+        self._weeks.clear()
+        self._game_weeks.clear()
+
+kickoff_index = KickoffIndex()
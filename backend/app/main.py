@@ -1,8 +1,22 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="Football Predictor API")
+from .database import async_engine
+from .teams import team_registry
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load teams up front; team edits from scripts are picked up through the
+    # teams data version (TeamRegistry.refresh_async)
+    async with AsyncSession(async_engine) as session:
+        await team_registry.load_async(session)
+    yield
+    await async_engine.dispose()
+
+app = FastAPI(title="Football Predictor API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,12 +30,20 @@ from .auth import router as auth_router
 from .weeks import router as weeks_router
 from .picks import router as picks_router
 from .leaderboard import router as leaderboard_router
+from .odds import router as odds_router
+from .live import router as live_router
+from .projections import router as projections_router
+from .rank_history import router as rank_history_router
 
 app.include_router(auth_router, prefix="/auth", tags=["auth"])
 app.include_router(weeks_router, prefix="/weeks", tags=["weeks"])
 app.include_router(picks_router, prefix="/picks", tags=["picks"])
 app.include_router(leaderboard_router, prefix="/leaderboard", tags=["leaderboard"])
+app.include_router(projections_router, prefix="/leaderboard", tags=["leaderboard"])
+app.include_router(rank_history_router, prefix="/leaderboard", tags=["leaderboard"])
+app.include_router(odds_router, prefix="/games", tags=["odds"])
+app.include_router(live_router, prefix="/weeks", tags=["live"])
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Welcome to Football Predictor API"}
@@ -1,5 +1,6 @@
+from datetime import datetime
 from typing import Optional
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, SQLModel, Index, UniqueConstraint, Column, DateTime, SmallInteger
 
 class User(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -14,26 +15,85 @@ class Team(SQLModel, table=True):
     logo_path: str
 
 class Week(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_week_season_week_number", "season", "week_number"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     season: int
     week_number: int
     start_date: str # ISO format
     end_date: str # ISO format
+    # Bumped whenever this week's games change; drives ETags and caches
+    data_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+
+class DataVersion(SQLModel, table=True):
+    # Change counters for data outside any week ("teams"); see app.versions
+    name: str = Field(primary_key=True)
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
 
 class Game(SQLModel, table=True):
+    __table_args__ = (
+        # Leaderboards filter on final games, optionally within a week
+        Index("ix_game_status_week_id", "status", "week_id"),
+        # A matchup is played once per week; scraped games upsert on this
+        UniqueConstraint("week_id", "home_team_id", "away_team_id", name="uq_game_week_id_home_team_id_away_team_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    week_id: int = Field(foreign_key="week.id")
+    week_id: int = Field(foreign_key="week.id", index=True)
     home_team_id: int = Field(foreign_key="team.id")
     away_team_id: int = Field(foreign_key="team.id")
     spread: float
     home_score: Optional[int] = None
     away_score: Optional[int] = None
     status: str = "scheduled" # scheduled, in_progress, final
-    game_time: Optional[str] = None # ISO format datetime
+    game_time: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True)))
     over_under: Optional[float] = None
 
 class Pick(SQLModel, table=True):
+    __table_args__ = (
+        # One pick per user per game; also serves lookups by user_id
+        UniqueConstraint("user_id", "game_id", name="uq_pick_user_id_game_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
-    game_id: int = Field(foreign_key="game.id")
+    game_id: int = Field(foreign_key="game.id", index=True)
     selected_team_id: int = Field(foreign_key="team.id")
+    # Home line when the pick was made; grading uses it instead of Game.spread
+    spread: Optional[float] = None
+
+class GameLine(SQLModel, table=True):
+    # Append-only line history, one row per change (see app.odds). Lines are
+    # stored in tenths of a point as smallints, keyed by (game, time) with no
+    # surrogate id, so a row is ~16 bytes of data
+    game_id: int = Field(foreign_key="game.id", primary_key=True)
+    recorded_at: datetime = Field(sa_column=Column(DateTime(timezone=True), primary_key=True))
+    spread_tenths: Optional[int] = Field(default=None, sa_type=SmallInteger)
+    over_under_tenths: Optional[int] = Field(default=None, sa_type=SmallInteger)
+    # Sportsbook id from the scoreboard (e.g. 101 = BetMGM); 0 = set manually
+    source_id: int = Field(default=0, sa_type=SmallInteger)
+
+class Standing(SQLModel, table=True):
+    # Per-user, per-week graded pick counts, maintained by app.standings
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    week_id: int = Field(foreign_key="week.id", primary_key=True, index=True)
+    correct: int = 0
+    total: int = 0
+    pushes: int = 0
+
+class RankSnapshot(SQLModel, table=True):
+    # Per-user weekly and season-to-date ranks, rebuilt a season at a time by
+    # app.rank_history. Keyed so a user's season chart is one index range
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    season: int = Field(primary_key=True)
+    week_number: int = Field(primary_key=True)
+    week_id: int = Field(foreign_key="week.id", index=True)
+    # None for a week the user had no graded picks in
+    week_rank: Optional[int] = None
+    week_correct: int = 0
+    week_total: int = 0
+    season_rank: int
+    season_correct: int
+    season_total: int
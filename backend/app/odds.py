@@ -0,0 +1,113 @@
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy import DateTime, Integer, SmallInteger, cast, column, values, func, literal, select as sa_select, true, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .database import get_async_session
+from .models import Game, GameLine
+
+router = APIRouter()
+
+MANUAL_SOURCE = 0
+
+class Line(BaseModel):
+    recorded_at: datetime
+    spread: Optional[float]
+    over_under: Optional[float]
+    source_id: int
+
+def to_tenths(value: Optional[float]) -> Optional[int]:
+    return None if value is None else round(value * 10)
+
+def to_line(row: GameLine) -> Line:
+    return Line(
+        recorded_at=row.recorded_at,
+        spread=None if row.spread_tenths is None else row.spread_tenths / 10,
+        over_under=None if row.over_under_tenths is None else row.over_under_tenths / 10,
+        source_id=row.source_id
+    )
+
+def record_lines(
+    session: Session,
+    lines: Sequence[Tuple[int, Optional[float], Optional[float], int]],
+    recorded_at: Optional[datetime] = None
+) -> int:
+    """
+    Append (game_id, spread, over_under, source_id) lines to the history in
+    one statement, skipping games whose latest recorded line is the same.
+    The caller commits. Returns the number of rows appended.
+    """
+    if not lines:
+        return 0
+
+    incoming = values(
+        column("game_id", Integer),
+        column("spread_tenths", SmallInteger),
+        column("over_under_tenths", SmallInteger),
+        column("source_id", SmallInteger),
+        name="incoming"
+    ).data([(game_id, to_tenths(spread), to_tenths(total), source) for game_id, spread, total, source in lines])
+
+    latest = (
+        sa_select(GameLine.spread_tenths, GameLine.over_under_tenths)
+        .where(GameLine.game_id == incoming.c.game_id)
+        .order_by(GameLine.recorded_at.desc())
+        .limit(1)
+        .lateral("latest")
+    )
+    timestamp = literal(recorded_at, DateTime(timezone=True)) if recorded_at else func.now()
+    # Casts, because Postgres types an all-NULL VALUES column as text
+    spread_tenths = cast(incoming.c.spread_tenths, SmallInteger)
+    over_under_tenths = cast(incoming.c.over_under_tenths, SmallInteger)
+    changed = (
+        sa_select(
+            incoming.c.game_id,
+            timestamp,
+            spread_tenths,
+            over_under_tenths,
+            incoming.c.source_id
+        )
+        .select_from(incoming.outerjoin(latest, true()))
+        .where(
+            tuple_(latest.c.spread_tenths, latest.c.over_under_tenths).is_distinct_from(
+                tuple_(spread_tenths, over_under_tenths)
+            )
+        )
+    )
+    stmt = insert(GameLine).from_select(
+        ["game_id", "recorded_at", "spread_tenths", "over_under_tenths", "source_id"], changed
+    ).on_conflict_do_nothing()
+    return session.execute(stmt).rowcount
+
+def line_at_query(game_id: int, at: datetime):
+    # Served by the (game_id, recorded_at) primary key
+    return (
+        select(GameLine)
+        .where(GameLine.game_id == game_id, GameLine.recorded_at <= at)
+        .order_by(GameLine.recorded_at.desc())
+        .limit(1)
+    )
+
+def line_at(session: Session, game_id: int, at: datetime) -> Optional[Line]:
+    """The line that was current for a game at a given time."""
+    row = session.exec(line_at_query(game_id, at)).first()
+    return to_line(row) if row else None
+
+@router.get("/{game_id}/lines", response_model=List[Line])
+async def read_line_history(game_id: int, session: AsyncSession = Depends(get_async_session)):
+    rows = (await session.exec(
+        select(GameLine).where(GameLine.game_id == game_id).order_by(GameLine.recorded_at)
+    )).all()
+    if not rows and not await session.get(Game, game_id):
+        raise HTTPException(status_code=404, detail="Game not found")
+    return [to_line(row) for row in rows]
+
+@router.get("/{game_id}/line", response_model=Line)
+async def read_line_at(game_id: int, at: datetime, session: AsyncSession = Depends(get_async_session)):
+    row = (await session.exec(line_at_query(game_id, at))).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="No line recorded for this game at that time")
+    return to_line(row)
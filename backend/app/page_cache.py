@@ -0,0 +1,144 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional
+from .config import settings
+
+class Snapshot(NamedTuple):
+    sha256: str
+    fetched_at: float
+    # Last time the server confirmed this is still the current content
+    checked_at: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+class FetchResult(NamedTuple):
+    content: bytes
+    sha256: str
+    # False when the server answered 304 or sent the same bytes as last time
+    changed: bool
+
+class PageCache:
+    """
+    Content-addressed store of fetched pages. Each distinct page body is
+    kept once, gzip-compressed, as objects/<sha256>.gz; index/<url hash>.json
+    records every snapshot of a URL in fetch order with its ETag and
+    Last-Modified, so later fetches can be conditional and old snapshots can
+    be re-parsed offline. The index also remembers the last snapshot that
+    was ingested, so a fetch that failed to ingest is retried.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _object_path(self, sha256: str) -> str:
+        return os.path.join(self.root, "objects", sha256[:2], f"{sha256}.gz")
+
+    def _index_path(self, url: str) -> str:
+        return os.path.join(self.root, "index", f"{hashlib.sha256(url.encode()).hexdigest()[:32]}.json")
+
+    def _read_index(self, url: str) -> Dict:
+        try:
+            with open(self._index_path(url)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"url": url, "snapshots": []}
+
+    def _write_index(self, index: Dict) -> None:
+        path = self._index_path(index["url"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp_path, path)
+
+    def urls(self) -> List[str]:
+        index_dir = os.path.join(self.root, "index")
+        if not os.path.isdir(index_dir):
+            return []
+        urls = []
+        for name in sorted(os.listdir(index_dir)):
+            if name.endswith(".json"):
+                with open(os.path.join(index_dir, name)) as f:
+                    urls.append(json.load(f)["url"])
+        return urls
+
+    def history(self, url: str) -> List[Snapshot]:
+        return [Snapshot(**s) for s in self._read_index(url)["snapshots"]]
+
+    def latest(self, url: str) -> Optional[Snapshot]:
+        history = self.history(url)
+        return history[-1] if history else None
+
+    def ingested(self, url: str) -> Optional[str]:
+        """Hash of the URL's last snapshot that was successfully ingested."""
+        return self._read_index(url).get("ingested")
+
+    def mark_ingested(self, url: str, sha256: str) -> None:
+        # Only call once the ingest has committed
+        index = self._read_index(url)
+        index["ingested"] = sha256
+        self._write_index(index)
+
+    def load(self, sha256: str) -> bytes:
+        with gzip.open(self._object_path(sha256), "rb") as f:
+            return f.read()
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for the URL's latest snapshot."""
+        latest = self.latest(url)
+        if latest is None or not os.path.exists(self._object_path(latest.sha256)):
+            return {}
+        headers = {}
+        if latest.etag:
+            headers["If-None-Match"] = latest.etag
+        if latest.last_modified:
+            headers["If-Modified-Since"] = latest.last_modified
+        return headers
+
+    def record(self, url: str, status_code: int, content: bytes, headers) -> FetchResult:
+        """Store a response (200 or 304) to a request made with validators(url)."""
+        index = self._read_index(url)
+        snapshots = index["snapshots"]
+        latest = snapshots[-1] if snapshots else None
+        now = time.time()
+        etag = headers.get("ETag") or (latest or {}).get("etag")
+        last_modified = headers.get("Last-Modified") or (latest or {}).get("last_modified")
+
+        if status_code == 304:
+            sha256 = latest["sha256"]
+            content = self.load(sha256)
+        else:
+            sha256 = hashlib.sha256(content).hexdigest()
+            path = self._object_path(sha256)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with gzip.open(f"{path}.tmp", "wb") as f:
+                    f.write(content)
+                os.replace(f"{path}.tmp", path)
+
+        changed = latest is None or latest["sha256"] != sha256
+        if changed:
+            snapshots.append(Snapshot(sha256, now, now, etag, last_modified)._asdict())
+        else:
+            latest.update(checked_at=now, etag=etag, last_modified=last_modified)
+        self._write_index(index)
+        return FetchResult(content, sha256, changed)
+
+    def fetch(self, http, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 15) -> FetchResult:
+        """Conditional GET through a requests.Session; raises requests.RequestException on failure."""
+        response = http.get(url, headers={**(headers or {}), **self.validators(url)}, timeout=timeout)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return self.record(url, response.status_code, response.content, response.headers)
+
+    async def fetch_async(self, client, url: str) -> FetchResult:
+        """Conditional GET through an httpx.AsyncClient; raises httpx.HTTPError on failure."""
+        response = await client.get(url, headers=self.validators(url))
+        if response.status_code != 304:
+            response.raise_for_status()
+        return self.record(url, response.status_code, response.content, response.headers)
+
+page_cache = PageCache(settings.PAGE_CACHE_DIR)
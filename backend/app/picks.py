@@ -1,11 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-from typing import List
-from pydantic import BaseModel
-from datetime import datetime, timezone
-from .database import get_session
+from sqlmodel import select, func, or_, and_, case, literal
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import Integer, column, values
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from .database import get_async_session
 from .models import Pick, User, Game
-from .auth import get_current_user
+from .auth import get_current_user, get_token_user, TokenUser
+from .locks import kickoff_index
+from .versions import bump_game_week_versions
+from .standings import grade_game, pick_contribution
+from .weeks import GameRead, to_game_read
 
 router = APIRouter()
 
@@ -13,142 +20,272 @@ class PickCreate(BaseModel):
     game_id: int
     selected_team_id: int
 
+class PickBatch(BaseModel):
+    picks: List[PickCreate] = Field(max_length=64)
+
+class BatchPickResult(BaseModel):
+    game_id: int
+    success: bool
+    pick: Optional[Pick] = None
+    error: Optional[str] = None
+
+class Record(BaseModel):
+    wins: int = 0
+    losses: int = 0
+    pushes: int = 0
+
+class ComparedGame(BaseModel):
+    game: GameRead
+    locked: bool
+    my_pick: Optional[int] = None
+    their_pick: Optional[int] = None
+    # They have picked, but the game hasn't kicked off yet
+    their_pick_hidden: bool = False
+    # "win", "loss" or "push" against each pick's locked spread, once final
+    my_result: Optional[str] = None
+    their_result: Optional[str] = None
+
+class Comparison(BaseModel):
+    week_id: int
+    other_user_id: int
+    games: List[ComparedGame]
+    # Over games where both picks are visible
+    agreed: int
+    disagreed: int
+    my_record: Record
+    their_record: Record
+
+def pick_result(game: Game, selected_team_id: Optional[int], spread: Optional[float]) -> Optional[str]:
+    if selected_team_id is None:
+        return None
+    correct, total, pushes = pick_contribution(grade_game(game, spread), selected_team_id)
+    if pushes:
+        return "push"
+    if total:
+        return "win" if correct else "loss"
+    return None
+
+def add_result(record: Record, result: Optional[str]):
+    if result == "win":
+        record.wins += 1
+    elif result == "loss":
+        record.losses += 1
+    elif result == "push":
+        record.pushes += 1
+
+def game_locked():
+    # SQL twin of WeekKickoffs.is_locked, for filtering other users' picks
+    return or_(Game.status != "scheduled", and_(Game.game_time.is_not(None), Game.game_time <= func.now()))
+
+async def check_game_open(session: AsyncSession, game_id: int, detail: str):
+    locked = await kickoff_index.is_locked(session, game_id)
+    if locked is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    if locked:
+        raise HTTPException(status_code=400, detail=detail)
+
+async def upsert_picks(session: AsyncSession, user_id: int, selections: Dict[int, int]) -> List[Pick]:
+    """
+    Insert-or-update the user's picks (game_id -> selected_team_id) in one
+    statement. The SELECT only yields rows for games that are still open, so
+    the kickoff lock is enforced atomically and the (user_id, game_id)
+    constraint makes concurrent submissions safe. Each pick snapshots the
+    game's current spread for grading. Picks for locked or missing games are
+    simply not returned. The weeks' data versions move, so projections
+    include the new picks.
+    """
+    choices = values(
+        column("game_id", Integer), column("selected_team_id", Integer), name="choice"
+    ).data(list(selections.items()))
+    open_games = (
+        select(literal(user_id), Game.id, choices.c.selected_team_id, Game.spread)
+        .join(choices, choices.c.game_id == Game.id)
+        .where(Game.status == "scheduled")
+        .where(or_(Game.game_time.is_(None), Game.game_time > func.now()))
+    )
+    insert_stmt = insert(Pick).from_select(["user_id", "game_id", "selected_team_id", "spread"], open_games)
+    # Changing a pick re-locks it at the current line
+    upsert = insert_stmt.on_conflict_do_update(
+        constraint="uq_pick_user_id_game_id",
+        set_={
+            "selected_team_id": insert_stmt.excluded.selected_team_id,
+            "spread": insert_stmt.excluded.spread
+        }
+    ).returning(Pick)
+
+    picks = (await session.scalars(upsert)).all()
+    if picks:
+        await bump_game_week_versions(session, [p.game_id for p in picks])
+    return picks
+
 @router.post("/", response_model=Pick)
-def create_pick(
+async def create_pick(
     pick_data: PickCreate, 
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
-    # Check if game exists
-    game = session.get(Game, pick_data.game_id)
-    if not game:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    # Check if game has started
-    if game.status != "scheduled":
+    await check_game_open(session, pick_data.game_id, "Cannot make picks on games that have started")
+
+    picks = await upsert_picks(session, current_user.id, {pick_data.game_id: pick_data.selected_team_id})
+    if not picks:
+        # Kicked off since the index was refreshed
+        await session.rollback()
         raise HTTPException(status_code=400, detail="Cannot make picks on games that have started")
-    
-    if game.game_time:
-        try:
-            # Handle different ISO format variations
-            game_time_str = game.game_time
-            if 'Z' in game_time_str:
-                game_time_str = game_time_str.replace('Z', '+00:00')
-            game_time = datetime.fromisoformat(game_time_str)
-            
-            # Ensure game_time is timezone-aware
-            if game_time.tzinfo is None:
-                game_time = game_time.replace(tzinfo=timezone.utc)
-            
-            now = datetime.now(timezone.utc)
-            if now >= game_time:
-                raise HTTPException(status_code=400, detail="Cannot make picks on games that have started")
-        except ValueError as e:
-            # If we can't parse the time, log it but don't block the pick
-            print(f"Warning: Could not parse game_time '{game.game_time}': {e}")
-        
-    # Check if pick already exists for this game/user
-    existing_pick = session.exec(
-        select(Pick)
-        .where(Pick.user_id == current_user.id)
-        .where(Pick.game_id == pick_data.game_id)
-    ).first()
-    
-    if existing_pick:
-        # Update existing pick
-        existing_pick.selected_team_id = pick_data.selected_team_id
-        session.add(existing_pick)
-        session.commit()
-        session.refresh(existing_pick)
-        return existing_pick
-    else:
-        # Create new pick
-        pick = Pick(
-            user_id=current_user.id,
-            game_id=pick_data.game_id,
-            selected_team_id=pick_data.selected_team_id
-        )
-        session.add(pick)
-        session.commit()
-        session.refresh(pick)
-        return pick
 
-@router.get("/me", response_model=List[Pick])
-def read_my_picks(
-    session: Session = Depends(get_session),
+    await session.commit()
+    return picks[0]
+
+@router.post("/batch", response_model=List[BatchPickResult])
+async def create_picks_batch(
+    batch: PickBatch,
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
-    picks = session.exec(select(Pick).where(Pick.user_id == current_user.id)).all()
+    # Later entries for the same game win, as if submitted one by one
+    selections = {p.game_id: p.selected_team_id for p in batch.picks}
+
+    # Lock status comes from the kickoff index, not a query per batch
+    errors = {}
+    for game_id in selections:
+        locked = await kickoff_index.is_locked(session, game_id)
+        if locked is None:
+            errors[game_id] = "Game not found"
+        elif locked:
+            errors[game_id] = "Cannot make picks on games that have started"
+
+    open_selections = {k: v for k, v in selections.items() if k not in errors}
+    written = {}
+    if open_selections:
+        written = {p.game_id: p for p in await upsert_picks(session, current_user.id, open_selections)}
+        await session.commit()
+
+    results = []
+    for game_id in selections:
+        pick = written.get(game_id)
+        if pick:
+            results.append(BatchPickResult(game_id=game_id, success=True, pick=pick))
+        else:
+            # A game that kicked off between validation and the write is skipped by the upsert
+            error = errors.get(game_id, "Cannot make picks on games that have started")
+            results.append(BatchPickResult(game_id=game_id, success=False, error=error))
+    return results
+
+@router.get("/me", response_model=List[Pick])
+async def read_my_picks(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: TokenUser = Depends(get_token_user)
+):
+    picks = (await session.exec(select(Pick).where(Pick.user_id == current_user.id))).all()
     return picks
 
+@router.get("/compare", response_model=Comparison)
+async def compare_picks(
+    week_id: int,
+    other_user_id: int,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: TokenUser = Depends(get_token_user)
+):
+    mine, theirs = aliased(Pick), aliased(Pick)
+    locked = game_locked()
+    # One query pairs both users' picks per game; the other user's picks on
+    # games that haven't kicked off never leave the database
+    rows = (await session.exec(
+        select(
+            Game,
+            locked,
+            mine.selected_team_id,
+            mine.spread,
+            case((locked, theirs.selected_team_id)),
+            case((locked, theirs.spread)),
+            theirs.id.is_not(None)
+        )
+        .outerjoin(mine, and_(mine.game_id == Game.id, mine.user_id == current_user.id))
+        .outerjoin(theirs, and_(theirs.game_id == Game.id, theirs.user_id == other_user_id))
+        .where(Game.week_id == week_id)
+        .order_by(Game.game_time, Game.id)
+    )).all()
+
+    games, agreed, disagreed = [], 0, 0
+    my_record, their_record = Record(), Record()
+    for game, is_locked, my_pick, my_spread, their_pick, their_spread, they_picked in rows:
+        my_result = pick_result(game, my_pick, my_spread)
+        their_result = pick_result(game, their_pick, their_spread)
+        add_result(my_record, my_result)
+        add_result(their_record, their_result)
+        if my_pick is not None and their_pick is not None:
+            if my_pick == their_pick:
+                agreed += 1
+            else:
+                disagreed += 1
+
+        games.append(ComparedGame(
+            game=await to_game_read(session, game),
+            locked=is_locked,
+            my_pick=my_pick,
+            their_pick=their_pick,
+            their_pick_hidden=they_picked and their_pick is None,
+            my_result=my_result,
+            their_result=their_result
+        ))
+
+    return Comparison(
+        week_id=week_id,
+        other_user_id=other_user_id,
+        games=games,
+        agreed=agreed,
+        disagreed=disagreed,
+        my_record=my_record,
+        their_record=their_record
+    )
+
 @router.get("/user/{user_id}", response_model=List[Pick])
-def read_user_picks(
+async def read_user_picks(
     user_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: TokenUser = Depends(get_token_user)
 ):
-    picks = session.exec(select(Pick).where(Pick.user_id == user_id)).all()
+    query = select(Pick).where(Pick.user_id == user_id)
+    if user_id != current_user.id:
+        # Someone else's picks only show once their games have kicked off
+        query = query.join(Game, Game.id == Pick.game_id).where(game_locked())
+    picks = (await session.exec(query)).all()
     return picks
 
 @router.delete("/{game_id}", response_model=dict)
-def delete_pick(
+async def delete_pick(
     game_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
     # Check if game exists and hasn't started
-    game = session.get(Game, game_id)
-    if not game:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    # Check if game has started
-    if game.status != "scheduled":
-        raise HTTPException(status_code=400, detail="Cannot delete picks on games that have started")
-    
-    if game.game_time:
-        try:
-            # Handle different ISO format variations
-            game_time_str = game.game_time
-            if 'Z' in game_time_str:
-                game_time_str = game_time_str.replace('Z', '+00:00')
-            game_time = datetime.fromisoformat(game_time_str)
-            
-            # Ensure game_time is timezone-aware
-            if game_time.tzinfo is None:
-                game_time = game_time.replace(tzinfo=timezone.utc)
-            
-            now = datetime.now(timezone.utc)
-            if now >= game_time:
-                raise HTTPException(status_code=400, detail="Cannot delete picks on games that have started")
-        except ValueError as e:
-            # If we can't parse the time, log it but don't block the delete
-            print(f"Warning: Could not parse game_time '{game.game_time}': {e}")
-    
-    pick = session.exec(
+    await check_game_open(session, game_id, "Cannot delete picks on games that have started")
+
+    pick = (await session.exec(
         select(Pick)
         .where(Pick.user_id == current_user.id)
         .where(Pick.game_id == game_id)
-    ).first()
+    )).first()
     
     if not pick:
         raise HTTPException(status_code=404, detail="Pick not found")
         
-    session.delete(pick)
-    session.commit()
+    await session.delete(pick)
+    await bump_game_week_versions(session, [game_id])
+    await session.commit()
     
     return {"message": "Pick deleted successfully"}
 
 @router.get("/week/{week_id}/users", response_model=List[User])
-def read_users_with_picks(
+async def read_users_with_picks(
     week_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: TokenUser = Depends(get_token_user)
 ):
-    users = session.exec(
+    users = (await session.exec(
         select(User)
         .join(Pick)
         .join(Game)
         .where(Game.week_id == week_id)
         .distinct()
-    ).all()
+    )).all()
     return users
@@ -0,0 +1,289 @@
+import asyncio
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, TypeAdapter
+from sqlmodel import Session, select, func, or_
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .cache import create_cache
+from .config import settings
+from .database import async_engine, get_async_session
+from .leaderboard import leaderboard_builder
+from .models import Game, Pick, User, Week
+from .versions import data_versions
+
+router = APIRouter()
+
+# Standard deviation of NFL final margins around the closing line
+MARGIN_STDDEV = 13.5
+
+# Serialized projections keyed by "<scope>:<data version>" (the week's, or
+# the global one for a season), so results, new picks and line changes all
+# move the key
+projection_cache = create_cache("projections", 32)
+
+class Projection(BaseModel):
+    user_id: int
+    user_name: str
+    profile_picture: str | None
+    correct_picks: int
+    remaining_picks: int
+    expected_correct: float
+    # Ties share the place, as in the rankings
+    first: float
+    top3: float
+
+class Projections(BaseModel):
+    week_id: Optional[int]
+    season: Optional[int]
+    simulations: int
+    remaining_games: int
+    projections: List[Projection]
+
+projections_adapter = TypeAdapter(Projections)
+
+class SimulationInput(NamedTuple):
+    user_ids: List[int]
+    base: List[int]
+    # Remaining games' current home lines
+    spreads: List[float]
+    # (user index, game index, locked home line, picked home)
+    picks: List[Tuple[int, int, float, bool]]
+
+def simulate(data: SimulationInput, simulations: int, chunk_size: int = 1000, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Monte Carlo the remaining games. Each game's margin is drawn around the
+    spread-implied expectation (-spread), so a pick locked at a different
+    line than the current one has a better or worse than even chance. Every
+    (game, line) pair is a column: outcomes are a simulations x columns
+    matrix, picks a users x columns matrix, and one matmul per chunk gives
+    every user's correct picks in every simulation. The matmul is most of
+    the cost, so the columns are kept to a minimum (see below). A chunk's
+    scores are chunk_size x users float32 (20MB for 5000 users), so chunks
+    are kept small.
+    """
+    users = len(data.user_ids)
+    base = np.asarray(data.base, dtype=np.float32)
+    spreads = np.asarray(data.spreads, dtype=np.float32)
+
+    columns: Dict[Tuple[int, float], int] = {}
+    for _, game, line, _ in data.picks:
+        columns.setdefault((game, line), len(columns))
+    column_games = np.array([game for game, _ in columns], dtype=np.intp)
+    column_lines = np.array([line for _, line in columns], dtype=np.float32)
+
+    # An away pick wins unless home covers or the game pushes (away = 1 -
+    # home - push), so outcomes are [home covered | pushed | 1], with push
+    # columns only for whole-point lines. Home picks weigh +1 on their home
+    # column, away picks -1 on their home and push columns plus 1 on the
+    # constant, which also carries the current score. That is a third fewer
+    # columns than [home | away], and exact
+    push_columns = [c for (_, line), c in columns.items() if float(line).is_integer()]
+    push_index = {c: len(columns) + i for i, c in enumerate(push_columns)}
+    weights = np.zeros((users, len(columns) + len(push_columns) + 1), dtype=np.float32)
+    weights[:, -1] = base
+    remaining = np.zeros(users, dtype=np.int32)
+    for user, game, line, home in data.picks:
+        column = columns[(game, line)]
+        if home:
+            weights[user, column] = 1
+        else:
+            weights[user, column] = -1
+            if column in push_index:
+                weights[user, push_index[column]] = -1
+            weights[user, -1] += 1
+        remaining[user] += 1
+
+    # Users who can't reach the current third-best score never affect the
+    # max or the third-best value, so they are left out of the matrices
+    third_best = np.sort(base)[-3] if users >= 3 else -np.inf
+    live = np.flatnonzero(base + remaining >= third_best)
+    live_weights = np.ascontiguousarray(weights[live].T)
+
+    columns_count = len(columns)
+    first = np.zeros(users)
+    top3 = np.zeros(users)
+    outcome_totals = np.zeros(weights.shape[1])
+    rng = np.random.default_rng(seed)
+    for start in range(0, simulations, chunk_size):
+        n = min(chunk_size, simulations - start)
+        # Whole-point margins, so integer lines can push
+        margins = np.rint(rng.normal(-spreads, MARGIN_STDDEV, size=(n, len(spreads)))).astype(np.float32)
+        adjusted = margins[:, column_games] + column_lines
+        outcomes = np.empty((n, weights.shape[1]), dtype=np.float32)
+        np.greater(adjusted, 0, out=outcomes[:, :columns_count])
+        np.equal(adjusted[:, push_columns], 0, out=outcomes[:, columns_count:-1])
+        outcomes[:, -1] = 1
+        outcome_totals += outcomes.sum(axis=0)
+
+        scores = outcomes @ live_weights
+        best = scores.max(axis=1)
+        at_best = scores == best[:, None]
+        # Summing the masks as int8 is several times faster than as bool
+        first[live] += at_best.view(np.int8).sum(axis=0, dtype=np.int32)
+        if len(live) < 3:
+            top3[live] += n
+            continue
+
+        # Third-best score: scores are whole numbers, so step down from the
+        # best until three users are at or above it. That is rarely more
+        # than a point or two; partition the few sims that are further apart
+        third = best.copy()
+        short = np.flatnonzero(at_best.view(np.int8).sum(axis=1, dtype=np.int32) < 3)
+        for step in range(1, 3):
+            if not len(short):
+                break
+            third[short] = best[short] - step
+            at_or_above = (scores[short] >= third[short, None]).view(np.int8).sum(axis=1, dtype=np.int32)
+            short = short[at_or_above < 3]
+        if len(short):
+            third[short] = np.partition(scores[short], -3, axis=1)[:, -3]
+        top3[live] += (scores >= third[:, None]).view(np.int8).sum(axis=0, dtype=np.int32)
+
+    return {
+        "remaining": remaining,
+        # Every user's, including those left out above; scores are linear
+        # in the outcomes, so this is the score of the mean outcome
+        "expected": weights @ (outcome_totals / simulations),
+        "first": first / simulations,
+        "top3": top3 / simulations,
+    }
+
+def default_season(session: Session) -> Optional[int]:
+    return session.exec(select(func.max(Week.season))).first()
+
+def scope_filter(query, week_id: Optional[int], season: Optional[int]):
+    if week_id:
+        return query.where(Game.week_id == week_id)
+    return query.join(Week, Week.id == Game.week_id).where(Week.season == season)
+
+def load_simulation_input(session: Session, week_id: Optional[int], season: Optional[int]) -> Tuple[SimulationInput, Dict[int, Tuple[str, str | None]]]:
+    entries = leaderboard_builder()(session, week_id=week_id, season=season)
+
+    # Games left to grade; in-progress games are simulated from their line
+    games = session.exec(scope_filter(
+        select(Game.id, Game.spread, Game.home_team_id)
+        .where(or_(Game.status != "final", Game.home_score.is_(None), Game.away_score.is_(None))),
+        week_id, season
+    ).order_by(Game.id)).all()
+    game_index = {game_id: i for i, (game_id, _, _) in enumerate(games)}
+    home_teams = {game_id: home_team_id for game_id, _, home_team_id in games}
+    spreads = [spread for _, spread, _ in games]
+
+    picks = session.exec(
+        select(Pick.user_id, Pick.game_id, Pick.selected_team_id, func.coalesce(Pick.spread, Game.spread))
+        .join(Game, Game.id == Pick.game_id)
+        .where(Pick.game_id.in_(game_index.keys()))
+    ).all() if games else []
+
+    profiles = {e.user_id: (e.user_name, e.profile_picture) for e in entries}
+    missing = {user_id for user_id, *_ in picks} - profiles.keys()
+    if missing:
+        for user in session.exec(select(User).where(User.id.in_(missing))).all():
+            profiles[user.id] = (user.name, user.profile_picture)
+
+    user_ids = sorted(profiles)
+    user_index = {user_id: i for i, user_id in enumerate(user_ids)}
+    correct = {e.user_id: e.correct_picks for e in entries}
+    return SimulationInput(
+        user_ids=user_ids,
+        base=[correct.get(user_id, 0) for user_id in user_ids],
+        spreads=spreads,
+        picks=[
+            (user_index[user_id], game_index[game_id], line, selected_team_id == home_teams[game_id])
+            for user_id, game_id, selected_team_id, line in picks
+            if user_id in user_index
+        ],
+    ), profiles
+
+async def compute_projections(session: AsyncSession, week_id: Optional[int], season: Optional[int]) -> Projections:
+    data, profiles = await session.run_sync(load_simulation_input, week_id, season)
+    simulations = settings.PROJECTION_SIMULATIONS
+    # NumPy releases the GIL for the heavy parts, so keep it off the event loop
+    results = await run_in_threadpool(simulate, data, simulations) if data.user_ids else None
+
+    projections = []
+    for i, user_id in enumerate(data.user_ids):
+        name, picture = profiles[user_id]
+        projections.append(Projection(
+            user_id=user_id,
+            user_name=name,
+            profile_picture=picture,
+            correct_picks=data.base[i],
+            remaining_picks=int(results["remaining"][i]),
+            expected_correct=round(float(results["expected"][i]), 2),
+            first=round(float(results["first"][i]), 4),
+            top3=round(float(results["top3"][i]), 4),
+        ))
+    projections.sort(key=lambda p: (-p.first, -p.top3, -p.expected_correct, p.user_id))
+
+    return Projections(
+        week_id=week_id,
+        season=season,
+        simulations=simulations,
+        remaining_games=len(data.spreads),
+        projections=projections
+    )
+
+class ProjectionRuns:
+    """
+    At most one simulation per week/season at a time in this process.
+    Requests that miss the cache while one runs wait for it, or get the
+    scope's previous result if there is one; the next miss after it
+    finishes starts the run for the newer version.
+    """
+
+    def __init__(self):
+        self._running: Dict[str, asyncio.Task] = {}
+        self._latest: Dict[str, bytes] = {}
+
+    async def get(self, scope: str, cache_key: str, week_id: Optional[int], season: Optional[int]) -> bytes:
+        task = self._running.get(scope)
+        if task is None:
+            task = asyncio.create_task(self._run(scope, cache_key, week_id, season))
+            self._running[scope] = task
+        latest = self._latest.get(scope)
+        if latest is not None:
+            return latest
+        # Shielded, so a client going away doesn't cancel the shared run
+        return await asyncio.shield(task)
+
+    async def _run(self, scope: str, cache_key: str, week_id: Optional[int], season: Optional[int]) -> bytes:
+        try:
+            # Its own session: the run outlives the request that started it
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                projections = await compute_projections(session, week_id, season)
+            content = projections_adapter.dump_json(projections)
+            projection_cache.set(cache_key, content)
+            self._latest[scope] = content
+            return content
+        finally:
+            del self._running[scope]
+
+projection_runs = ProjectionRuns()
+
+@router.get("/projections", response_model=Projections)
+async def get_projections(
+    week_id: int | None = None,
+    season: int | None = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Each user's chance of finishing first / top 3 on the week's board, or
+    the season's (the latest season by default), over the games left.
+    While a newer version is being simulated the previous result is served.
+    """
+    if not week_id and not season:
+        season = await session.run_sync(default_season)
+        if season is None:
+            raise HTTPException(status_code=404, detail="No season to project")
+
+    versions = await data_versions.snapshot(session)
+    scope = f"week-{week_id}" if week_id else f"season-{season}"
+    version = versions.week_version(week_id) if week_id else versions.global_version
+    cache_key = f"{scope}:{version}"
+    content = projection_cache.get(cache_key)
+    if content is None:
+        content = await projection_runs.get(scope, cache_key, week_id, season)
+    return Response(content=content, media_type="application/json")
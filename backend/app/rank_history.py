@@ -0,0 +1,151 @@
+from typing import List, Optional
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy import insert
+from sqlmodel import Session, select, delete, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .database import get_async_session
+from .models import Game, RankSnapshot, Standing, User, Week
+
+router = APIRouter()
+
+class RankPoint(BaseModel):
+    week_id: int
+    week_number: int
+    week_rank: Optional[int]
+    week_correct: int
+    week_total: int
+    season_rank: int
+    season_correct: int
+    season_total: int
+
+class RankHistory(BaseModel):
+    user_id: int
+    season: int
+    weeks: List[RankPoint]
+
+def competition_rank_matrix(eligible: np.ndarray, correct: np.ndarray, total: np.ndarray) -> np.ndarray:
+    """
+    Competition ranks by the leaderboard's sort key within each row (week)
+    of week x user matrices, for the eligible cells; 0 elsewhere. One sort
+    of every eligible cell by (week, correct desc, win rate desc), then a
+    running max over the positions where the score changes.
+    """
+    weeks, users = np.nonzero(eligible)
+    c = correct[weeks, users]
+    t = total[weeks, users]
+    # The exact rate, as score_key uses, so ties match the leaderboard's
+    rate = np.divide(c, t, out=np.zeros(len(c)), where=t > 0)
+    order = np.lexsort((-rate, -c, weeks))
+    weeks, users, c, rate = weeks[order], users[order], c[order], rate[order]
+
+    changed = np.ones(len(order), dtype=bool)
+    changed[1:] = (weeks[1:] != weeks[:-1]) | (c[1:] != c[:-1]) | (rate[1:] != rate[:-1])
+    position = np.arange(len(order))
+    week_start = np.searchsorted(weeks, weeks)
+    ranks = np.zeros(eligible.shape, dtype=np.int64)
+    ranks[weeks, users] = np.maximum.accumulate(np.where(changed, position, 0)) - week_start + 1
+    return ranks
+
+def compute_rank_history(session: Session, season: int) -> List[dict]:
+    """
+    Every user's weekly and season-to-date rank after each graded week of a
+    season, from one read of the standings: week x user matrices of graded
+    counts, summed cumulatively down the weeks and ranked in one pass each.
+    A user appears on a week's board (and the season's, from then on) once
+    they have a graded pick, as on the leaderboard. Returns ranksnapshot rows.
+    """
+    weeks = session.exec(
+        select(Week.id, Week.week_number).where(Week.season == season).order_by(Week.week_number)
+    ).all()
+    week_index = {week_id: w for w, (week_id, _) in enumerate(weeks)}
+    standings = session.exec(
+        select(Standing.week_id, Standing.user_id, Standing.correct, Standing.total, Standing.pushes)
+        .where(Standing.week_id.in_(week_index.keys()))
+    ).all() if weeks else []
+    if not standings:
+        return []
+
+    # Plain tuples: numpy probes Row objects attribute by attribute
+    rows = np.array([tuple(row) for row in standings], dtype=np.int64)
+    user_ids, u = np.unique(rows[:, 1], return_inverse=True)
+    w = np.array([week_index[week_id] for week_id in rows[:, 0].tolist()], dtype=np.intp)
+    shape = (len(weeks), len(user_ids))
+    correct, total, graded = np.zeros(shape, np.int64), np.zeros(shape, np.int64), np.zeros(shape, np.int64)
+    correct[w, u] = rows[:, 2]
+    total[w, u] = rows[:, 3]
+    graded[w, u] = rows[:, 3] + rows[:, 4]
+
+    season_correct = np.cumsum(correct, axis=0)
+    season_total = np.cumsum(total, axis=0)
+    season_graded = np.cumsum(graded, axis=0)
+    week_ranks = competition_rank_matrix(graded > 0, correct, total)
+    season_ranks = competition_rank_matrix(season_graded > 0, season_correct, season_total)
+
+    # Weeks nobody has a graded pick in yet leave no snapshot
+    active = graded.any(axis=1)
+    sw, su = np.nonzero((season_graded > 0) & active[:, None])
+    columns = {
+        "user_id": user_ids[su].tolist(),
+        "week_number": np.array([week_number for _, week_number in weeks])[sw].tolist(),
+        "week_id": np.array([week_id for week_id, _ in weeks])[sw].tolist(),
+        "week_rank": [rank or None for rank in week_ranks[sw, su].tolist()],
+        "week_correct": correct[sw, su].tolist(),
+        "week_total": total[sw, su].tolist(),
+        "season_rank": season_ranks[sw, su].tolist(),
+        "season_correct": season_correct[sw, su].tolist(),
+        "season_total": season_total[sw, su].tolist(),
+    }
+    return [dict(zip(columns, row), season=season) for row in zip(*columns.values())]
+
+def rebuild_rank_history(session: Session, season: int) -> int:
+    """Replace a season's rank snapshots. Returns the number of rows written. Caller commits."""
+    snapshots = compute_rank_history(session, season)
+    session.execute(delete(RankSnapshot).where(RankSnapshot.season == season))
+    if snapshots:
+        session.execute(insert(RankSnapshot), snapshots)
+    return len(snapshots)
+
+def finalize_week(session: Session, week_id: int) -> bool:
+    """
+    Rebuild the season's rank history if every game of the week is final,
+    e.g. after a result lands. A week's snapshots (and every later week's
+    season ranks) are written once its results are all in, and rewritten
+    when one is corrected. Returns True if it rebuilt. Caller commits.
+    """
+    week = session.get(Week, week_id)
+    unfinished = session.exec(
+        select(func.count()).select_from(Game).where(Game.week_id == week_id, Game.status != "final")
+    ).one()
+    if week is None or unfinished:
+        return False
+    rebuild_rank_history(session, week.season)
+    return True
+
+@router.get("/history/{user_id}", response_model=RankHistory)
+async def read_rank_history(user_id: int, season: int | None = None, session: AsyncSession = Depends(get_async_session)):
+    """
+    A user's weekly and season-to-date rank after each graded week of a
+    season (the latest by default). Snapshots are written when a week's
+    results are all final (see finalize_week).
+    """
+    if season is None:
+        season = (await session.exec(select(func.max(Week.season)))).first()
+        if season is None:
+            raise HTTPException(status_code=404, detail="No season found")
+
+    # One range of the (user_id, season, week_number) primary key
+    rows = (await session.exec(
+        select(RankSnapshot)
+        .where(RankSnapshot.user_id == user_id, RankSnapshot.season == season)
+        .order_by(RankSnapshot.week_number)
+    )).all()
+    if not rows and not await session.get(User, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return RankHistory(
+        user_id=user_id,
+        season=season,
+        weeks=[RankPoint(**row.model_dump(exclude={"user_id", "season"})) for row in rows]
+    )
@@ -0,0 +1,124 @@
+import json
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import List, NamedTuple, Optional, Union
+
+SCOREBOARD_URL = "https://sports.yahoo.com/nfl/scoreboard/"
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36"
+}
+
+APP_STATE_MARKER = b"root.App.main ="
+
+# Yahoo status_type -> Game.status
+STATUS_MAP = {
+    "pregame": "scheduled",
+    "in_progress": "in_progress",
+    "final": "final",
+}
+
+class ScoreboardGame(NamedTuple):
+    yahoo_id: str
+    season: Optional[int]
+    week_number: Optional[int]
+    home_first_name: str
+    home_last_name: str
+    away_first_name: str
+    away_last_name: str
+    status: str
+    home_score: Optional[int]
+    away_score: Optional[int]
+    start_time: Optional[str]
+    # Home team's line (Home + spread vs Away) and the over/under
+    spread: Optional[float]
+    over_under: Optional[float]
+    # Yahoo's id for the sportsbook quoting the line
+    odds_source: Optional[int] = None
+
+    def kickoff(self) -> Optional[datetime]:
+        # Yahoo uses RFC 2822 dates, e.g. "Sun, 23 Nov 2025 18:00:00 +0000"
+        try:
+            return parsedate_to_datetime(self.start_time)
+        except (TypeError, ValueError):
+            return None
+
+_decoder = json.JSONDecoder()
+
+def decode_store(page: bytes, name: str, start: int, end: int) -> dict:
+    """
+    Decode just one store object (e.g. "GamesStore") out of the page's
+    `root.App.main` JSON. The rest of the ~1 MB page is never parsed.
+    """
+    marker = f'"{name}":'.encode()
+    index = page.find(marker, start, end)
+    if index == -1:
+        return {}
+    try:
+        store, _ = _decoder.raw_decode(page[index + len(marker):end].decode("utf-8"))
+    except ValueError:
+        return {}
+    return store if isinstance(store, dict) else {}
+
+def to_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def parse_odds(odds) -> tuple:
+    # Odds are keyed by sportsbook; use the first one quoting a spread
+    for book_id, book in (odds or {}).items():
+        if isinstance(book, dict) and book.get("home_spread") not in (None, ""):
+            return to_float(book.get("home_spread")), to_float(book.get("total")), to_int(book_id)
+    return None, None, None
+
+def parse_scoreboard(page: Union[bytes, str]) -> List[ScoreboardGame]:
+    """Parse the NFL games (teams, status, scores, kickoff, odds) out of a Yahoo scoreboard page."""
+    if isinstance(page, str):
+        page = page.encode("utf-8")
+
+    start = page.find(APP_STATE_MARKER)
+    if start == -1:
+        return []
+    end = page.find(b";\n", start)
+    if end == -1:
+        end = len(page)
+
+    games = decode_store(page, "GamesStore", start, end).get("games", {})
+    teams = decode_store(page, "TeamsStore", start, end).get("teams", {})
+
+    parsed = []
+    for yahoo_id, game in games.items():
+        if not yahoo_id.startswith("nfl.g."):
+            continue
+        status = STATUS_MAP.get(game.get("status_type"))
+        home = teams.get(game.get("home_team_id"))
+        away = teams.get(game.get("away_team_id"))
+        # Skip postponed/cancelled games and anything we can't match to teams
+        if status is None or not home or not away:
+            continue
+
+        spread, over_under, odds_source = parse_odds(game.get("odds"))
+        parsed.append(ScoreboardGame(
+            yahoo_id=yahoo_id,
+            season=to_int(game.get("season")),
+            week_number=to_int(game.get("week_number")),
+            home_first_name=home.get("first_name", ""),
+            home_last_name=home.get("last_name", ""),
+            away_first_name=away.get("first_name", ""),
+            away_last_name=away.get("last_name", ""),
+            status=status,
+            home_score=to_int(game.get("total_home_points")) if status != "scheduled" else None,
+            away_score=to_int(game.get("total_away_points")) if status != "scheduled" else None,
+            start_time=game.get("start_time"),
+            spread=spread,
+            over_under=over_under,
+            odds_source=odds_source,
+        ))
+    return parsed
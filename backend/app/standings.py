@@ -0,0 +1,152 @@
+from typing import Dict, Optional, Tuple
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select, delete
+from .models import Game, Pick, Week, Standing
+from .versions import bump_week_version
+from .leaderboard import invalidate_leaderboards
+from .odds import record_lines, MANUAL_SOURCE
+from .rank_history import finalize_week, rebuild_rank_history
+
+# Outcome of a game for grading purposes:
+#   None              -> not graded (not final or missing a score)
+#   (True, None)      -> push
+#   (True, team_id)   -> team that covered the spread
+Outcome = Optional[Tuple[bool, Optional[int]]]
+
+def grade_game(game: Game, spread: Optional[float] = None) -> Outcome:
+    """Grade a game against `spread` (a pick's locked line), or the game's current line."""
+    if game.status != "final" or game.home_score is None or game.away_score is None:
+        return None
+
+    # Spread logic (Home + Spread vs Away)
+    adjusted_home_score = game.home_score + (game.spread if spread is None else spread)
+    if adjusted_home_score > game.away_score:
+        return (True, game.home_team_id)
+    elif adjusted_home_score < game.away_score:
+        return (True, game.away_team_id)
+    return (True, None) # Push
+
+def pick_contribution(outcome: Outcome, selected_team_id: int) -> Tuple[int, int, int]:
+    """Return the (correct, total, pushes) a single pick adds for a game outcome."""
+    if outcome is None:
+        return (0, 0, 0)
+    winner_id = outcome[1]
+    if winner_id is None:
+        return (0, 0, 1)
+    return (1 if selected_team_id == winner_id else 0, 1, 0)
+
+def grading_inputs(game: Game) -> Optional[Tuple[int, int, float]]:
+    if grade_game(game) is None:
+        return None
+    return (game.home_score, game.away_score, game.spread)
+
+def update_game_result(
+    session: Session,
+    game: Game,
+    home_score: Optional[int],
+    away_score: Optional[int],
+    status: str,
+    spread: Optional[float] = None,
+) -> bool:
+    """
+    Apply a score/status change to a game and incrementally adjust the
+    standings of everyone who picked it. The caller must have locked the
+    game row (SELECT ... FOR UPDATE) so two writers can't grade the same
+    change, and is responsible for committing. Once every game of the week
+    is final, the season's rank history is rewritten too. Returns True if
+    the game's grading inputs changed.
+    """
+    before = Game(**game.model_dump())
+    old_values = (game.home_score, game.away_score, game.status, game.spread)
+
+    game.home_score = home_score
+    game.away_score = away_score
+    game.status = status
+    if spread is not None:
+        game.spread = spread
+    session.add(game)
+
+    if game.spread != before.spread:
+        record_lines(session, [(game.id, game.spread, game.over_under, MANUAL_SOURCE)])
+
+    if (game.home_score, game.away_score, game.status, game.spread) != old_values:
+        bump_week_version(session, game.week_id)
+
+    # Picks are graded against their own locked lines, so any change to a
+    # final game's score (or its line, for picks without one) can matter
+    if grading_inputs(before) == grading_inputs(game):
+        return False
+
+    # Game went final (or its result or line changed): cached leaderboards are stale
+    invalidate_leaderboards(game.week_id)
+
+    picks = session.exec(select(Pick).where(Pick.game_id == game.id)).all()
+
+    deltas = []
+    for pick in picks:
+        old = pick_contribution(grade_game(before, pick.spread), pick.selected_team_id)
+        new = pick_contribution(grade_game(game, pick.spread), pick.selected_team_id)
+        if old != new:
+            deltas.append({
+                "user_id": pick.user_id,
+                "week_id": game.week_id,
+                "correct": new[0] - old[0],
+                "total": new[1] - old[1],
+                "pushes": new[2] - old[2],
+            })
+    if deltas:
+        # Add the deltas in SQL rather than writing back counts read earlier, so
+        # writers grading other games for the same users can't overwrite them
+        stmt = insert(Standing).values(deltas)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=["user_id", "week_id"],
+            set_={
+                "correct": Standing.correct + stmt.excluded.correct,
+                "total": Standing.total + stmt.excluded.total,
+                "pushes": Standing.pushes + stmt.excluded.pushes,
+            }
+        ))
+
+    finalize_week(session, game.week_id)
+    return True
+
+def compute_standings(session: Session) -> Dict[Tuple[int, int], Tuple[int, int, int]]:
+    """Grade every final game from scratch: (user_id, week_id) -> (correct, total, pushes)."""
+    games = session.exec(select(Game).where(Game.status == "final")).all()
+    graded = {game.id: game for game in games if grade_game(game) is not None}
+
+    if not graded:
+        return {}
+
+    picks = session.exec(select(Pick).where(Pick.game_id.in_(graded.keys()))).all()
+
+    counts = {}
+    for pick in picks:
+        game = graded[pick.game_id]
+        key = (pick.user_id, game.week_id)
+        correct, total, pushes = counts.get(key, (0, 0, 0))
+        c, t, p = pick_contribution(grade_game(game, pick.spread), pick.selected_team_id)
+        counts[key] = (correct + c, total + t, pushes + p)
+    return counts
+
+def rebuild_standings(session: Session) -> int:
+    """Replace the standings table (and every season's rank history) with a full recompute. Returns the number of standings rows written."""
+    counts = compute_standings(session)
+
+    session.execute(delete(Standing))
+    for (user_id, week_id), (correct, total, pushes) in counts.items():
+        session.add(Standing(
+            user_id=user_id,
+            week_id=week_id,
+            correct=correct,
+            total=total,
+            pushes=pushes
+        ))
+    # Every leaderboard may have changed
+    for week_id in session.exec(select(Week.id)).all():
+        bump_week_version(session, week_id)
+    for season in session.exec(select(Week.season).distinct()).all():
+        rebuild_rank_history(session, season)
+    session.commit()
+    invalidate_leaderboards()
+    return len(counts)
@@ -0,0 +1,86 @@
+from typing import Dict, List, NamedTuple, Optional
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .models import Team
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.split()).lower()
+
+class _TeamIndex(NamedTuple):
+    by_id: Dict[int, Team]
+    by_abbreviation: Dict[str, Team]
+    by_name: Dict[str, Team]
+
+class TeamRegistry:
+    """
+    Process-wide cache of the (effectively immutable) Team table, indexed by
+    id, abbreviation, full name and Yahoo's first/last-name pair. Call
+    invalidate() after changing teams; an id miss also triggers one reload so
+    teams seeded by another process are picked up. Scripts that edit teams
+    bump the teams data version, and the API reloads through
+    refresh_async() when it moves.
+    """
+
+    def __init__(self):
+        self._index: Optional[_TeamIndex] = None
+        # Teams data version the index was loaded at, if known
+        self._version: Optional[int] = None
+
+    def _build(self, teams: List[Team]) -> _TeamIndex:
+        # Detached copies so cached teams never belong to a request's session
+        teams = [Team(**team.model_dump()) for team in teams]
+        index = _TeamIndex(
+            by_id={t.id: t for t in teams},
+            by_abbreviation={t.abbreviation.lower(): t for t in teams},
+            by_name={normalize_name(t.name): t for t in teams},
+        )
+        self._index = index
+        self._version = None
+        return index
+
+    def load(self, session: Session) -> _TeamIndex:
+        return self._build(session.exec(select(Team)).all())
+
+    async def load_async(self, session: AsyncSession) -> _TeamIndex:
+        return self._build((await session.exec(select(Team))).all())
+
+    async def refresh_async(self, session: AsyncSession, version: int) -> None:
+        if self._index is None or self._version != version:
+            await self.load_async(session)
+            self._version = version
+
+    def invalidate(self) -> None:
+        self._index = None
+
+    def _get_index(self, session: Session) -> _TeamIndex:
+        index = self._index
+        if index is None:
+            index = self.load(session)
+        return index
+
+    def all(self, session: Session) -> List[Team]:
+        return list(self._get_index(session).by_id.values())
+
+    def get(self, session: Session, team_id: int) -> Optional[Team]:
+        team = self._get_index(session).by_id.get(team_id)
+        if team is None:
+            team = self.load(session).by_id.get(team_id)
+        return team
+
+    async def get_async(self, session: AsyncSession, team_id: int) -> Optional[Team]:
+        index = self._index
+        if index is None or team_id not in index.by_id:
+            index = await self.load_async(session)
+        return index.by_id.get(team_id)
+
+    def by_abbreviation(self, session: Session, abbreviation: str) -> Optional[Team]:
+        return self._get_index(session).by_abbreviation.get(abbreviation.lower())
+
+    def by_name(self, session: Session, name: str) -> Optional[Team]:
+        return self._get_index(session).by_name.get(normalize_name(name))
+
+    def by_yahoo_name(self, session: Session, first_name: str, last_name: str) -> Optional[Team]:
+        # Yahoo splits names into city ("Los Angeles") and nickname ("Rams")
+        return self.by_name(session, f"{first_name} {last_name}")
+
+team_registry = TeamRegistry()
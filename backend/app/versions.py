@@ -0,0 +1,74 @@
+import hashlib
+import time
+from typing import Dict, NamedTuple, Optional
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .config import settings
+from .models import DataVersion, Game, Week
+
+def bump_week_version(session: Session, week_id: int) -> None:
+    """Mark a week's games (and therefore its leaderboards) as changed. Caller commits."""
+    session.execute(
+        update(Week)
+        .where(Week.id == week_id)
+        .values(data_version=Week.data_version + 1)
+    )
+
+async def bump_game_week_versions(session: AsyncSession, game_ids) -> None:
+    """bump_week_version for the weeks of some games, e.g. after pick writes. Caller commits."""
+    await session.execute(
+        update(Week)
+        .where(Week.id.in_(select(Game.week_id).where(Game.id.in_(game_ids))))
+        .values(data_version=Week.data_version + 1)
+    )
+
+def bump_team_version(session: Session) -> None:
+    """Mark the teams as changed (the API reloads its team registry). Caller commits."""
+    stmt = insert(DataVersion).values(name="teams", version=1)
+    session.execute(stmt.on_conflict_do_update(
+        index_elements=["name"], set_={"version": DataVersion.version + 1}
+    ))
+
+class VersionSnapshot(NamedTuple):
+    weeks: Dict[int, int]
+    # Changes whenever any week is added or any week's version moves
+    global_version: str
+    # Moves on team edits only; games embed their teams
+    teams: int
+
+    def week_version(self, week_id: int) -> Optional[int]:
+        return self.weeks.get(week_id)
+
+class DataVersions:
+    """
+    In-process copy of every week's data_version and the teams version. It
+    is refreshed from the database at most every ETAG_VERSION_TTL_SECONDS,
+    so conditional requests are answered without a query in between.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._snapshot: Optional[VersionSnapshot] = None
+        self._loaded_at = 0.0
+
+    async def snapshot(self, session: AsyncSession) -> VersionSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return snapshot
+
+        rows = (await session.exec(select(Week.id, Week.data_version).order_by(Week.id))).all()
+        weeks = {week_id: version for week_id, version in rows}
+        digest = hashlib.blake2b(repr(sorted(weeks.items())).encode(), digest_size=8).hexdigest()
+
+        teams = (await session.exec(select(DataVersion.version).where(DataVersion.name == "teams"))).first()
+
+        snapshot = VersionSnapshot(weeks=weeks, global_version=digest, teams=teams or 0)
+        self._snapshot = snapshot
+        self._loaded_at = time.monotonic()
+        return snapshot
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+
+data_versions = DataVersions(ttl=settings.ETAG_VERSION_TTL_SECONDS)
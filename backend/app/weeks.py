@@ -1,34 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-from typing import List
-from .database import get_session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import datetime, timezone
+from typing import List, Optional
+from pydantic import BaseModel
+from .database import get_async_session
 from .models import Week, Game, Team
+from .teams import team_registry
+from .versions import data_versions
+from .http_cache import make_etag, check_etag
+from .locks import kickoff_index
 
 router = APIRouter()
 
+class GameRead(BaseModel):
+    id: int
+    week_id: int
+    home_team: Team
+    away_team: Team
+    spread: float
+    home_score: Optional[int] = None
+    away_score: Optional[int] = None
+    status: str
+    game_time: Optional[datetime] = None
+    over_under: Optional[float] = None
+
+async def to_game_read(session: AsyncSession, game: Game) -> GameRead:
+    # Teams come from the in-process registry, so a week is one statement
+    return GameRead(
+        id=game.id,
+        week_id=game.week_id,
+        home_team=await team_registry.get_async(session, game.home_team_id),
+        away_team=await team_registry.get_async(session, game.away_team_id),
+        spread=game.spread,
+        home_score=game.home_score,
+        away_score=game.away_score,
+        status=game.status,
+        game_time=game.game_time,
+        over_under=game.over_under
+    )
+
 @router.get("/", response_model=List[Week])
-def read_weeks(session: Session = Depends(get_session)):
-    weeks = session.exec(select(Week).order_by(Week.season.desc(), Week.week_number.desc())).all()
+async def read_weeks(request: Request, response: Response, session: AsyncSession = Depends(get_async_session)):
+    versions = await data_versions.snapshot(session)
+    not_modified = check_etag(request, response, make_etag("weeks", versions.global_version))
+    if not_modified:
+        return not_modified
+
+    weeks = (await session.exec(select(Week).order_by(Week.season.desc(), Week.week_number.desc()))).all()
     return weeks
 
-@router.get("/{week_id}/games", response_model=List[dict])
-def read_week_games(week_id: int, session: Session = Depends(get_session)):
-    games = session.exec(select(Game).where(Game.week_id == week_id)).all()
-    
-    result = []
-    for game in games:
-        home_team = session.get(Team, game.home_team_id)
-        away_team = session.get(Team, game.away_team_id)
-        result.append({
-            "id": game.id,
-            "week_id": game.week_id,
-            "home_team": home_team,
-            "away_team": away_team,
-            "spread": game.spread,
-            "home_score": game.home_score,
-            "away_score": game.away_score,
-            "status": game.status,
-            "game_time": game.game_time,
-            "over_under": game.over_under
-        })
-    return result
+@router.get("/{week_id}/games", response_model=List[GameRead])
+async def read_week_games(week_id: int, request: Request, response: Response, session: AsyncSession = Depends(get_async_session)):
+    versions = await data_versions.snapshot(session)
+    version = versions.week_version(week_id)
+    if version is not None:
+        not_modified = check_etag(request, response, make_etag("games", week_id, version, versions.teams))
+        if not_modified:
+            return not_modified
+
+    await team_registry.refresh_async(session, versions.teams)
+    games = (await session.exec(select(Game).where(Game.week_id == week_id))).all()
+    return [await to_game_read(session, game) for game in games]
+
+@router.get("/{week_id}/open-games", response_model=List[GameRead])
+async def read_open_games(week_id: int, session: AsyncSession = Depends(get_async_session)):
+    # Games that can still be picked, in kickoff order (games without a kickoff first)
+    versions = await data_versions.snapshot(session)
+    await team_registry.refresh_async(session, versions.teams)
+    week = await kickoff_index.week(session, week_id)
+    open_ids = week.open_game_ids(datetime.now(timezone.utc))
+    if not open_ids:
+        return []
+
+    games = {g.id: g for g in (await session.exec(select(Game).where(Game.id.in_(open_ids)))).all()}
+    return [await to_game_read(session, games[game_id]) for game_id in open_ids if game_id in games]
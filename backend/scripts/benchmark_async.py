@@ -0,0 +1,154 @@
+import sys
+import os
+import argparse
+import asyncio
+import statistics
+import subprocess
+import time
+from typing import List
+import httpx
+from fastapi import FastAPI, Depends
+from sqlmodel import Session, select
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.database import get_session
+from app.models import Week, Game
+from app.teams import team_registry
+from app.weeks import GameRead
+from app.leaderboard import LeaderboardEntry, read_standings_leaderboard
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+# Reference app with the same read endpoints as sync `def` handlers on the
+# sync engine, i.e. how the API ran before the async port
+sync_app = FastAPI()
+
+@sync_app.get("/")
+def sync_root():
+    return {"message": "ok"}
+
+@sync_app.get("/weeks/", response_model=List[Week])
+def sync_read_weeks(session: Session = Depends(get_session)):
+    return session.exec(select(Week).order_by(Week.season.desc(), Week.week_number.desc())).all()
+
+@sync_app.get("/weeks/{week_id}/games", response_model=List[GameRead])
+def sync_read_week_games(week_id: int, session: Session = Depends(get_session)):
+    games = session.exec(select(Game).where(Game.week_id == week_id)).all()
+    return [
+        GameRead(
+            **game.model_dump(exclude={"home_team_id", "away_team_id"}),
+            home_team=team_registry.get(session, game.home_team_id),
+            away_team=team_registry.get(session, game.away_team_id)
+        )
+        for game in games
+    ]
+
+@sync_app.get("/leaderboard/", response_model=List[LeaderboardEntry])
+def sync_get_leaderboard(week_id: int | None = None, session: Session = Depends(get_session)):
+    return read_standings_leaderboard(session, week_id=week_id)
+
+# The sync reference app has no response caching, so "async" runs the real
+# app with the leaderboard cache and version snapshot turned off (it still
+# looks up the week versions, once per request) to measure the async port
+# alone; "async-cached" is the app as deployed, and the gap between the two
+# is what the caches add
+NO_CACHES = {"CACHE_BACKEND": "memory", "LEADERBOARD_CACHE_SIZE": "0", "ETAG_VERSION_TTL_SECONDS": "0"}
+MODES = {
+    "sync": ("benchmark_async:sync_app", os.path.dirname(os.path.abspath(__file__)), {}),
+    "async": ("app.main:app", os.path.abspath(BACKEND_DIR), NO_CACHES),
+    "async-cached": ("app.main:app", os.path.abspath(BACKEND_DIR), {}),
+}
+
+def start_server(target: str, app_dir: str, port: int, env: dict) -> subprocess.Popen:
+    process = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", target,
+        "--app-dir", app_dir,
+        "--port", str(port),
+        "--log-level", "warning",
+        "--no-access-log",
+    ], env={**os.environ, **env})
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise SystemExit(f"Server {target} did not start")
+
+async def run_load(base_url: str, paths: List[str], concurrency: int, duration: float):
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker(offset: int):
+            nonlocal errors
+            i = offset
+            while time.perf_counter() < deadline:
+                path = paths[i % len(paths)]
+                i += 1
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return len(latencies) / elapsed, latencies, errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare requests/sec of the async API against sync handlers on a local Postgres, with and without the API's caches.")
+    parser.add_argument("--week-id", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    args = parser.parse_args()
+
+    paths = [
+        "/weeks/",
+        f"/weeks/{args.week_id}/games",
+        "/leaderboard/",
+        f"/leaderboard/?week_id={args.week_id}",
+    ]
+
+    results = {}
+    for mode in args.modes:
+        target, app_dir, env = MODES[mode]
+        process = start_server(target, app_dir, args.port, env)
+        try:
+            # Warm up connection pools and caches before measuring
+            asyncio.run(run_load(f"http://127.0.0.1:{args.port}", paths, args.concurrency, 2))
+            rps, latencies, errors = asyncio.run(
+                run_load(f"http://127.0.0.1:{args.port}", paths, args.concurrency, args.duration)
+            )
+        finally:
+            process.terminate()
+            process.wait()
+
+        latencies.sort()
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+        results[mode] = rps
+        print(f"{mode:12} {rps:8.1f} req/s   p50 {p50:7.1f} ms   p99 {p99:7.1f} ms   errors {errors}")
+
+    if "sync" in results and "async" in results:
+        print(f"async port (both uncached): {results['async'] / results['sync']:.2f}x")
+    if "async" in results and "async-cached" in results:
+        print(f"caches on the async app:    {results['async-cached'] / results['async']:.2f}x")
+
+if __name__ == "__main__":
+    main()
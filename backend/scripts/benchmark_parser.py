@@ -0,0 +1,145 @@
+import sys
+import os
+import argparse
+import json
+import re
+import statistics
+import time
+import tracemalloc
+from bs4 import BeautifulSoup
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.scoreboard import parse_scoreboard
+
+DEFAULT_PAGE = os.path.join(os.path.dirname(__file__), "yahoo_nfl.html")
+
+def parse_with_soup(content: bytes):
+    """The BeautifulSoup parsing scrape_yahoo_nfl.py used before app.scoreboard, kept as the baseline."""
+    soup = BeautifulSoup(content, "html.parser")
+
+    game_times = {}
+    for script in soup.find_all("script"):
+        if script.string and "root.App.main =" in script.string:
+            content_str = script.string
+            start_index = content_str.find("root.App.main =") + len("root.App.main =")
+            end_index = content_str.find(";\n", start_index)
+            if end_index == -1:
+                end_index = content_str.find(";", start_index)
+            data = json.loads(content_str[start_index:end_index].strip())
+
+            def extract_game_times(obj):
+                if isinstance(obj, dict):
+                    for k, v in obj.items():
+                        if isinstance(k, str) and k.startswith("nfl.g.") and isinstance(v, dict):
+                            if "start_time" in v:
+                                game_times[k] = v["start_time"]
+                        extract_game_times(v)
+                elif isinstance(obj, list):
+                    for item in obj:
+                        extract_game_times(item)
+
+            extract_game_times(data)
+
+    games = []
+    for item in soup.find_all("li", {"data-tst": re.compile(r"^GameItem-")}):
+        game_id_str = item.get("data-tst", "").replace("GameItem-", "")
+        team_items = item.find_all("li", class_="team")
+        if len(team_items) < 2:
+            continue
+        names = []
+        for team_item in team_items[:2]:
+            city = team_item.find("span", {"data-tst": "first-name"})
+            name = team_item.find("span", {"data-tst": "last-name"})
+            names.append((city.get_text(strip=True), name.get_text(strip=True)) if city and name else None)
+        if None in names:
+            continue
+
+        spread = 0.0
+        odds_div = item.find("div", class_="odds", title=True)
+        if odds_div and "total" not in odds_div.get("class", []):
+            odds_match = re.search(r"([+-]?\d+(\.\d+)?)", odds_div.get_text(strip=True).split()[-1])
+            if odds_match:
+                spread = float(odds_match.group(1))
+
+        over_under = None
+        ou_div = item.select_one("div.odds.total")
+        if ou_div:
+            ou_match = re.search(r"(\d+(\.\d+)?)", ou_div.get_text(strip=True))
+            if ou_match:
+                over_under = float(ou_match.group(1))
+
+        games.append({
+            "yahoo_id": game_id_str,
+            "away": names[0],
+            "home": names[1],
+            "spread": spread,
+            "over_under": over_under,
+            "start_time": game_times.get(game_id_str),
+        })
+    return games
+
+def measure(parse, content: bytes, runs: int):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        parse(content)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / (1024 * 1024)
+
+def compare(content: bytes):
+    legacy = {g["yahoo_id"]: g for g in parse_with_soup(content)}
+    fast = {g.yahoo_id: g for g in parse_scoreboard(content)}
+    print(f"\nGames: BeautifulSoup {len(legacy)}, fast {len(fast)}")
+
+    mismatches = 0
+    for yahoo_id in sorted(set(legacy) | set(fast)):
+        old, new = legacy.get(yahoo_id), fast.get(yahoo_id)
+        if old is None or new is None:
+            print(f"  {yahoo_id}: only found by {'fast' if old is None else 'BeautifulSoup'}")
+            mismatches += 1
+            continue
+        same = (
+            old["home"] == (new.home_first_name, new.home_last_name)
+            and old["away"] == (new.away_first_name, new.away_last_name)
+            and old["over_under"] == new.over_under
+            and old["start_time"] == new.start_time
+        )
+        if not same:
+            mismatches += 1
+            print(f"  {yahoo_id}: differs")
+        elif new.spread is not None and old["spread"] != new.spread:
+            # The HTML shows the favorite's line, which has the wrong sign for away favorites
+            print(f"  {yahoo_id}: spread {old['spread']:+} (favorite's line) -> {new.spread:+} (home line)")
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the JSON-slicing scoreboard parser against the old BeautifulSoup parser.")
+    parser.add_argument("--file", default=DEFAULT_PAGE)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.file, "rb") as f:
+        content = f.read()
+    print(f"Page: {args.file} ({len(content) / 1024:.0f} KB)\n")
+
+    results = {}
+    for label, parse in (("BeautifulSoup", parse_with_soup), ("fast", parse_scoreboard)):
+        median, peak = measure(parse, content, args.runs)
+        results[label] = (median, peak)
+        print(f"{label:14} median {median:8.2f} ms   peak memory {peak:7.2f} MB")
+
+    (old_time, old_peak), (new_time, new_peak) = results["BeautifulSoup"], results["fast"]
+    print(f"\nSpeedup {old_time / new_time:.1f}x, {old_peak / new_peak:.1f}x less peak memory")
+
+    if compare(content):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import sys
+import os
+import argparse
+import random
+import statistics
+import time
+from sqlalchemy import create_engine, text
+from sqlmodel import SQLModel
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.config import settings
+from app import models  # Register tables with SQLModel
+
+# Indexes added by the ab15995d425e migration, dropped for the "before" run
+INDEXES = {
+    "ix_game_status_week_id": "CREATE INDEX ix_game_status_week_id ON game (status, week_id)",
+    "ix_game_week_id": "CREATE INDEX ix_game_week_id ON game (week_id)",
+    "ix_pick_game_id": "CREATE INDEX ix_pick_game_id ON pick (game_id)",
+    "ix_week_season_week_number": "CREATE INDEX ix_week_season_week_number ON week (season, week_number)",
+}
+# Unique constraints whose indexes serve the same queries: the pick one
+# (ab15995d425e) and the game matchup one (d3701b98fd67), whose leading
+# week_id column serves the game-by-week lookups
+UNIQUE_CONSTRAINTS = [
+    ("pick", "uq_pick_user_id_game_id", "(user_id, game_id)"),
+    ("game", "uq_game_week_id_home_team_id_away_team_id", "(week_id, home_team_id, away_team_id)"),
+]
+
+# Hot queries issued by picks.py, weeks.py and leaderboard.py
+QUERIES = {
+    "picks for user": "SELECT * FROM pick WHERE user_id = :user_id",
+    "pick for user and game": "SELECT * FROM pick WHERE user_id = :user_id AND game_id = :game_id",
+    "games for week": "SELECT * FROM game WHERE week_id = :week_id",
+    "week by number": "SELECT * FROM week WHERE season = :season AND week_number = :week_number",
+    "final games in week": "SELECT * FROM game WHERE status = 'final' AND week_id = :week_id",
+    "picks for week's final games": """
+        SELECT pick.* FROM pick
+        WHERE pick.game_id IN (SELECT id FROM game WHERE status = 'final' AND week_id = :week_id)
+    """,
+    "users with picks in week": """
+        SELECT DISTINCT "user".* FROM "user"
+        JOIN pick ON pick.user_id = "user".id
+        JOIN game ON game.id = pick.game_id
+        WHERE game.week_id = :week_id
+    """,
+}
+
+def seed(conn, users: int, weeks: int, graded_weeks: int, season: int):
+    print(f"Seeding {users} users, {weeks} weeks...")
+    conn.execute(text("""
+        INSERT INTO team (name, abbreviation, logo_path)
+        SELECT 'Team ' || n, 't' || n, '/logos/t' || n || '.svg' FROM generate_series(1, 32) AS n
+    """))
+    conn.execute(text("""
+        INSERT INTO week (season, week_number, start_date, end_date)
+        SELECT :season, n, '2025-09-01', '2025-09-07' FROM generate_series(1, :weeks) AS n
+    """), {"season": season, "weeks": weeks})
+    # 16 games per week: team 2k+1 hosts team 2k+2, rotated each week
+    conn.execute(text("""
+        INSERT INTO game (week_id, home_team_id, away_team_id, spread, status, game_time)
+        SELECT w.id,
+               ((2 * k + w.week_number) % 32) + 1,
+               ((2 * k + 1 + w.week_number) % 32) + 1,
+               round((random() * 14 - 7)::numeric * 2) / 2,
+               'scheduled',
+               '2025-09-07T17:00:00Z'
+        FROM week w CROSS JOIN generate_series(0, 15) AS k
+        WHERE w.season = :season
+    """), {"season": season})
+    conn.execute(text("""
+        UPDATE game SET status = 'final',
+               home_score = floor(random() * 42)::int,
+               away_score = floor(random() * 42)::int
+        WHERE week_id IN (SELECT id FROM week WHERE season = :season AND week_number <= :graded)
+    """), {"season": season, "graded": graded_weeks})
+    conn.execute(text("""
+        INSERT INTO "user" (email, name)
+        SELECT 'bench' || n || '@example.com', 'Bench User ' || n FROM generate_series(1, :users) AS n
+    """), {"users": users})
+    conn.execute(text("""
+        INSERT INTO pick (user_id, game_id, selected_team_id)
+        SELECT u.id, g.id, CASE WHEN random() < 0.5 THEN g.home_team_id ELSE g.away_team_id END
+        FROM "user" u CROSS JOIN game g
+        WHERE random() < 0.9
+    """))
+    count = conn.execute(text("SELECT count(*) FROM pick")).scalar()
+    print(f"Seeded {count} picks")
+
+def drop_indexes(conn):
+    for table, name, _ in UNIQUE_CONSTRAINTS:
+        conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}"))
+    for name in INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    conn.execute(text("ANALYZE"))
+
+def create_indexes(conn):
+    for table, name, columns in UNIQUE_CONSTRAINTS:
+        conn.execute(text(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE {columns}"))
+    for ddl in INDEXES.values():
+        conn.execute(text(ddl))
+    conn.execute(text("ANALYZE"))
+
+def random_params(conn, rng: random.Random):
+    users = conn.execute(text('SELECT min(id), max(id) FROM "user"')).one()
+    games = conn.execute(text("SELECT min(id), max(id) FROM game")).one()
+    weeks = conn.execute(text("SELECT id, season, week_number FROM week")).all()
+    week = rng.choice(weeks)
+    return {
+        "user_id": rng.randint(*users),
+        "game_id": rng.randint(*games),
+        "week_id": week.id,
+        "season": week.season,
+        "week_number": week.week_number,
+    }
+
+def run_suite(conn, label: str, runs: int, show_plans: bool):
+    print(f"\n=== {label} ===")
+    rng = random.Random(0)
+    params = [random_params(conn, rng) for _ in range(runs)]
+    results = {}
+    for name, sql in QUERIES.items():
+        timings = []
+        for p in params:
+            start = time.perf_counter()
+            conn.execute(text(sql), p).all()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        median = statistics.median(timings)
+        p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+        results[name] = median
+        print(f"{name:32} median {median:8.2f} ms   p95 {p95:8.2f} ms")
+
+        if show_plans:
+            plan = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"), params[0]).scalars().all()
+            for line in plan:
+                print(f"    {line}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a realistic season and compare hot query latency with and without the pick/game indexes.")
+    parser.add_argument("--database-url", required=True, help="Scratch database; its tables are dropped and recreated")
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--weeks", type=int, default=18)
+    parser.add_argument("--graded-weeks", type=int, default=12)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--plans", action="store_true", help="Print EXPLAIN ANALYZE output for each query")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse data from a previous run")
+    args = parser.parse_args()
+
+    if args.database_url == settings.DATABASE_URL:
+        print("Refusing to benchmark against the application database (DATABASE_URL).")
+        sys.exit(1)
+
+    engine = create_engine(args.database_url)
+    if not args.skip_seed:
+        SQLModel.metadata.drop_all(engine)
+        SQLModel.metadata.create_all(engine)
+        with engine.begin() as conn:
+            seed(conn, args.users, args.weeks, args.graded_weeks, season=2025)
+
+    with engine.begin() as conn:
+        drop_indexes(conn)
+    with engine.connect() as conn:
+        before = run_suite(conn, "Before (no indexes)", args.runs, args.plans)
+
+    with engine.begin() as conn:
+        create_indexes(conn)
+    with engine.connect() as conn:
+        after = run_suite(conn, "After (indexed)", args.runs, args.plans)
+
+    print("\n=== Speedup (median) ===")
+    for name in QUERIES:
+        print(f"{name:32} {before[name] / after[name]:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import sys
+import os
+import argparse
+import hashlib
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import requests
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.database import engine
+from app.ingest import ChangeTracker, apply_scores, ingest_scoreboard
+from app.page_cache import FetchResult, page_cache
+from app.scoreboard import SCOREBOARD_URL, REQUEST_HEADERS, ScoreboardGame, parse_scoreboard
+
+class LiveFetcher:
+    """
+    Conditional GETs of the live scoreboard with the validators kept in
+    memory. Polling every 30 seconds through the page cache would archive
+    every score change (and rewrite the URL's index every poll), so a
+    snapshot is only archived when a game's status changes: pregame,
+    kickoffs and finals.
+    """
+
+    def __init__(self, http: requests.Session, url: str):
+        self.http = http
+        self.url = url
+        self.last: Optional[FetchResult] = None
+        self.headers = {}
+        self.validators: Dict[str, str] = {}
+        self.archived_statuses: Optional[Dict[str, str]] = None
+
+    def fetch(self) -> FetchResult:
+        """Raises requests.RequestException on failure."""
+        response = self.http.get(self.url, headers={**REQUEST_HEADERS, **self.validators}, timeout=15)
+        if response.status_code == 304 and self.last is not None:
+            return self.last._replace(changed=False)
+        response.raise_for_status()
+
+        self.headers = response.headers
+        self.validators = {
+            request_header: response.headers[header]
+            for header, request_header in (("ETag", "If-None-Match"), ("Last-Modified", "If-Modified-Since"))
+            if response.headers.get(header)
+        }
+        sha256 = hashlib.sha256(response.content).hexdigest()
+        self.last = FetchResult(response.content, sha256, self.last is None or self.last.sha256 != sha256)
+        return self.last
+
+    def archive(self, games: List[ScoreboardGame]) -> None:
+        statuses = {g.yahoo_id: g.status for g in games}
+        if self.last is not None and statuses != self.archived_statuses:
+            page_cache.record(self.url, 200, self.last.content, self.headers)
+            self.archived_statuses = statuses
+
+def fetch_page(fetcher: LiveFetcher, file: Optional[str]) -> Optional[FetchResult]:
+    if file:
+        # Re-read every poll so the fixture can be edited while the worker runs
+        with open(file, "rb") as f:
+            content = f.read()
+        return FetchResult(content, hashlib.sha256(content).hexdigest(), True)
+    try:
+        return fetcher.fetch()
+    except requests.RequestException as e:
+        print(f"Error fetching {fetcher.url}: {e}")
+        return None
+
+def write_changes(tracker: ChangeTracker, page: FetchResult, games: List[ScoreboardGame]) -> int:
+    """Write only the games whose fingerprint moved since the last poll, in one commit."""
+    changed = tracker.changed_games(games)
+    if changed:
+        with Session(engine) as session:
+            # Lines and kickoffs first, so games new to the week exist before scores are applied
+            ingest_scoreboard(session, changed)
+            scores = apply_scores(session, changed)
+            session.commit()
+        print(f"{len(changed)} game(s) changed, {scores} score/status update(s)")
+    tracker.mark_written(page.sha256, games)
+    return len(changed)
+
+def next_poll_delay(games: List[ScoreboardGame], now: datetime, live_interval: float, idle_interval: float) -> float:
+    """Poll fast while games are live (or due to kick off), otherwise sleep until the next kickoff."""
+    if any(g.status == "in_progress" for g in games):
+        return live_interval
+
+    kickoffs = [g.kickoff() for g in games if g.status == "scheduled"]
+    kickoffs = [k for k in kickoffs if k is not None]
+    if not kickoffs:
+        return idle_interval
+
+    # A game past its kickoff that is still "pregame" is about to go live
+    until_kickoff = (min(kickoffs) - now).total_seconds()
+    return min(max(until_kickoff, live_interval), idle_interval)
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll the Yahoo NFL scoreboard and write live scores, lines and final results.")
+    parser.add_argument("--url", default=SCOREBOARD_URL, help="Scoreboard URL (e.g. a local fixture server)")
+    parser.add_argument("--file", help="Read the scoreboard from a local HTML file instead, e.g. scripts/yahoo_nfl.html")
+    parser.add_argument("--live-interval", type=float, default=30, help="Seconds between polls while games are live")
+    parser.add_argument("--idle-interval", type=float, default=900, help="Maximum seconds between polls otherwise")
+    parser.add_argument("--once", action="store_true", help="Poll a single time and exit")
+    args = parser.parse_args()
+
+    fetcher = LiveFetcher(requests.Session(), args.url)
+    tracker = ChangeTracker()
+    games: List[ScoreboardGame] = []
+    while True:
+        page = fetch_page(fetcher, args.file)
+        failed = page is None
+        if page is not None and tracker.page_changed(page.sha256):
+            # On failure nothing is marked written, so the next poll retries
+            # the page even if it hasn't changed
+            try:
+                games = parse_scoreboard(page.content)
+                if not args.file:
+                    fetcher.archive(games)
+                changed = write_changes(tracker, page, games)
+                live = sum(1 for g in games if g.status == "in_progress")
+                print(f"{datetime.now():%H:%M:%S} polled {len(games)} games ({live} live), {changed} changed")
+            except SQLAlchemyError as e:
+                failed = True
+                print(f"{datetime.now():%H:%M:%S} database write failed, retrying: {e}")
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                failed = True
+                print(f"{datetime.now():%H:%M:%S} could not parse the scoreboard, retrying: {e!r}")
+        elif page is not None:
+            # Same bytes as the last poll: nothing to parse or write
+            print(f"{datetime.now():%H:%M:%S} page unchanged")
+
+        if args.once:
+            break
+
+        if failed:
+            delay = args.live_interval # Retry soon after a failed fetch or write
+        else:
+            delay = next_poll_delay(games, datetime.now(timezone.utc), args.live_interval, args.idle_interval)
+        time.sleep(delay)
+
+if __name__ == "__main__":
+    main()
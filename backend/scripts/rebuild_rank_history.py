@@ -0,0 +1,69 @@
+import sys
+import os
+import argparse
+from sqlmodel import Session, select
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.database import engine
+from app.models import RankSnapshot, Week
+from app.rank_history import rebuild_rank_history
+from app.leaderboard import compute_leaderboard
+
+def as_ranks(leaderboard):
+    return {e.user_id: e.rank for e in leaderboard}
+
+def verify_season(session, season):
+    # Each week's ranks should match that week's full recompute, and the last
+    # graded week's season ranks the season leaderboard
+    snapshots = session.exec(select(RankSnapshot).where(RankSnapshot.season == season)).all()
+    by_week = {}
+    for s in snapshots:
+        by_week.setdefault((s.week_number, s.week_id), []).append(s)
+
+    mismatches = 0
+    checks = [
+        (f"Season {season} week {week_number}", compute_leaderboard(session, week_id=week_id),
+         {s.user_id: s.week_rank for s in rows if s.week_rank is not None})
+        for (week_number, week_id), rows in sorted(by_week.items())
+    ]
+    if by_week:
+        last = by_week[max(by_week)]
+        checks.append((f"Season {season} overall", compute_leaderboard(session, season=season),
+                       {s.user_id: s.season_rank for s in last}))
+
+    for label, leaderboard, actual in checks:
+        expected = as_ranks(leaderboard)
+        if expected != actual:
+            mismatches += 1
+            print(f"MISMATCH {label}:")
+            for user_id in sorted(set(expected) | set(actual)):
+                if expected.get(user_id) != actual.get(user_id):
+                    print(f"  user {user_id}: expected rank {expected.get(user_id)}, got {actual.get(user_id)}")
+        else:
+            print(f"OK {label}: {len(actual)} ranks")
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the per-week rank snapshots behind /leaderboard/history from the standings.")
+    parser.add_argument("--season", type=int, help="Season to rebuild (default: every season)")
+    parser.add_argument("--verify", action="store_true", help="Compare the snapshots against full leaderboard recomputes")
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        seasons = [args.season] if args.season else session.exec(select(Week.season).distinct().order_by(Week.season)).all()
+        mismatches = 0
+        for season in seasons:
+            rows = rebuild_rank_history(session, season)
+            session.commit()
+            print(f"Rebuilt season {season} rank history: {rows} rows")
+            if args.verify:
+                mismatches += verify_season(session, season)
+
+        if mismatches:
+            print(f"{mismatches} leaderboard(s) differ")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
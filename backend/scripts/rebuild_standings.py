@@ -0,0 +1,52 @@
+import sys
+import os
+import argparse
+from sqlmodel import Session, select
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.database import engine
+from app.models import Week
+from app.standings import rebuild_standings
+from app.leaderboard import read_standings_leaderboard, compute_leaderboard
+
+def as_scores(leaderboard):
+    return {e.user_id: (e.correct_picks, e.total_picks, e.win_rate) for e in leaderboard}
+
+def verify_standings(session):
+    # Compare the standings-backed leaderboard against a full recompute,
+    # overall and for every week
+    week_ids = [None] + list(session.exec(select(Week.id)).all())
+    mismatches = 0
+    for week_id in week_ids:
+        expected = as_scores(compute_leaderboard(session, week_id=week_id))
+        actual = as_scores(read_standings_leaderboard(session, week_id=week_id))
+        label = "Overall" if week_id is None else f"Week id {week_id}"
+        if expected != actual:
+            mismatches += 1
+            print(f"MISMATCH {label}:")
+            for user_id in sorted(set(expected) | set(actual)):
+                if expected.get(user_id) != actual.get(user_id):
+                    print(f"  user {user_id}: expected {expected.get(user_id)}, got {actual.get(user_id)}")
+        else:
+            print(f"OK {label}: {len(actual)} entries")
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the leaderboard standings table from games and picks.")
+    parser.add_argument("--verify", action="store_true", help="Compare the rebuilt standings against the full recompute")
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        rows = rebuild_standings(session)
+        print(f"Rebuilt standings: {rows} rows")
+
+        if args.verify:
+            mismatches = verify_standings(session)
+            if mismatches:
+                print(f"{mismatches} leaderboard(s) differ")
+                sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import sys
+import os
+import argparse
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.page_cache import page_cache
+from scrape_yahoo_nfl import ingest_pages
+
+def list_snapshots(urls):
+    for url in urls:
+        print(url)
+        for snapshot in page_cache.history(url):
+            fetched = datetime.fromtimestamp(snapshot.fetched_at)
+            checked = datetime.fromtimestamp(snapshot.checked_at)
+            print(f"  {snapshot.sha256[:12]}  fetched {fetched:%Y-%m-%d %H:%M:%S}  last seen {checked:%Y-%m-%d %H:%M:%S}")
+
+def main():
+    parser = argparse.ArgumentParser(description="List cached scoreboard snapshots, or re-run ingestion against them without fetching.")
+    parser.add_argument("--match", default="", help="Only URLs containing this text, e.g. season=2025")
+    parser.add_argument("--list", action="store_true", help="List snapshots instead of ingesting")
+    parser.add_argument("--all", action="store_true", help="Replay every snapshot in fetch order, not just the latest per URL")
+    parser.add_argument("--sha", help="Ingest a single snapshot by (prefix of) its content hash")
+    args = parser.parse_args()
+
+    urls = [url for url in page_cache.urls() if args.match in url]
+    if args.list:
+        list_snapshots(urls)
+        return
+
+    snapshots = [s for url in urls for s in page_cache.history(url)]
+    if args.sha:
+        snapshots = [s for s in snapshots if s.sha256.startswith(args.sha)][:1]
+    elif not args.all:
+        snapshots = [page_cache.latest(url) for url in urls]
+    snapshots = sorted((s for s in snapshots if s), key=lambda s: s.fetched_at)
+
+    if not snapshots:
+        print("No matching snapshots")
+        return
+    # One ingest per snapshot so replayed odds/time changes land in order
+    for snapshot in snapshots:
+        print(f"Replaying {snapshot.sha256[:12]}")
+        ingest_pages([page_cache.load(snapshot.sha256)])
+
+if __name__ == "__main__":
+    main()
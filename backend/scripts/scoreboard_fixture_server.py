@@ -0,0 +1,63 @@
+import sys
+import os
+import argparse
+import hashlib
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Serves saved scoreboard pages so live_scores.py can be exercised offline:
+#   python scripts/scoreboard_fixture_server.py scripts/yahoo_nfl.html halftime.html final.html
+#   python scripts/live_scores.py --url http://localhost:8002/ --live-interval 2
+
+def make_handler(pages, requests_per_page):
+    state = {"requests": 0}
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            # Step through the pages in order, then keep serving the last one
+            index = min(state["requests"] // requests_per_page, len(pages) - 1)
+            state["requests"] += 1
+            with open(pages[index], "rb") as f:
+                body = f.read()
+            etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+            # Honour validators like Yahoo's CDN does
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                print(f"Not modified {os.path.basename(pages[index])}")
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", formatdate(os.path.getmtime(pages[index]), usegmt=True))
+            self.end_headers()
+            self.wfile.write(body)
+            print(f"Served {os.path.basename(pages[index])}")
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve saved Yahoo scoreboard pages, advancing to the next page every N requests.")
+    parser.add_argument("pages", nargs="+", help="HTML snapshots, in the order they should be served")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--requests-per-page", type=int, default=1)
+    args = parser.parse_args()
+
+    for page in args.pages:
+        if not os.path.exists(page):
+            print(f"{page} not found")
+            sys.exit(1)
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args.pages, args.requests_per_page))
+    print(f"Serving {len(args.pages)} page(s) on http://127.0.0.1:{args.port}/")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -1,234 +1,162 @@
 import requests
-from bs4 import BeautifulSoup
-import json
-import re
+import httpx
+import argparse
+import asyncio
 import os
 import time
 import sys
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
 
 # Add parent directory to path to import app modules
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
-from sqlmodel import Session, select
+from sqlmodel import Session
 from app.database import engine
-from app.models import Team, Game, Week
-
-def get_current_week():
-    # Start date: September 2, 2025 (Monday before Week 1)
-    start_date = datetime(2025, 9, 2)
-    today = datetime.now()
-    
-    # Calculate days passed
-    days_passed = (today - start_date).days
-    
-    # Calculate week number (integer division by 7, plus 1)
-    # If days_passed is negative (before season), default to Week 1
-    if days_passed < 0:
-        return 1
-        
-    week_number = (days_passed // 7) + 1
-    return week_number
-
-def scrape_yahoo_nfl():
-    url = "https://sports.yahoo.com/nfl/scoreboard/"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36"
-    }
-
-    cache_file = "yahoo_nfl.html"
-    content = None
-
-    if os.path.exists(cache_file):
-        last_modified = os.path.getmtime(cache_file)
-        if time.time() - last_modified < 86400:  # 24 hours
-            print(f"Using cached file: {cache_file}")
-            with open(cache_file, "rb") as f:
-                content = f.read()
-
-    if content is None:
-        print("Fetching from URL...")
+from app.ingest import apply_scores, ingest_scoreboard
+from app.page_cache import FetchResult, page_cache
+from app.scoreboard import SCOREBOARD_URL, REQUEST_HEADERS, parse_scoreboard
+
+def ingest_pages(pages: List[bytes]) -> bool:
+    """Ingest scoreboard pages in one transaction. Returns True once it has committed."""
+    # Yahoo's own season/week numbers decide which Week each game belongs to
+    parsed_games = [game for page in pages for game in parse_scoreboard(page)]
+    if not parsed_games:
+        print("No games found on the scoreboard page(s)")
+        return False
+
+    with Session(engine) as session:
+        summaries, unknown = ingest_scoreboard(session, parsed_games)
+        scores = apply_scores(session, parsed_games)
+        session.commit()
+
+    for name in sorted(set(unknown)):
+        print(f"Warning: Team '{name}' not found in DB.")
+    for (season, week_number), summary in sorted(summaries.items()):
+        print(f"Season {season} week {week_number}: {summary.inserted} inserted, {summary.updated} updated, {summary.unchanged} unchanged")
+    print(f"{scores} score/status update(s)")
+    return True
+
+def cached_page(url: str) -> Optional[FetchResult]:
+    latest = page_cache.latest(url)
+    return FetchResult(page_cache.load(latest.sha256), latest.sha256, False) if latest else None
+
+def scrape_yahoo_nfl(offline: bool = False, force: bool = False):
+    url = SCOREBOARD_URL
+
+    if offline:
+        page = cached_page(url)
+        if page is None:
+            print("No cached snapshot of the scoreboard")
+            return
+        print("Using the latest cached snapshot")
+    else:
         try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            content = response.content
-            with open(cache_file, "wb") as f:
-                f.write(content)
+            page = page_cache.fetch(requests.Session(), url, headers=REQUEST_HEADERS)
         except requests.RequestException as e:
             print(f"Error fetching URL: {e}")
             return
-
-    soup = BeautifulSoup(content, "html.parser")
-    
-    # Parse JSON data for game times
-    game_times = {}
-    try:
-        script_tags = soup.find_all("script")
-        for script in script_tags:
-            if script.string and "root.App.main =" in script.string:
-                content_str = script.string
-                start_marker = "root.App.main ="
-                start_index = content_str.find(start_marker)
-                if start_index != -1:
-                    start_index += len(start_marker)
-                    end_index = content_str.find(";\n", start_index)
-                    if end_index == -1:
-                        end_index = content_str.find(";", start_index)
-                    
-                    if end_index != -1:
-                        json_str = content_str[start_index:end_index].strip()
-                        try:
-                            data = json.loads(json_str)
-                            def extract_game_times(obj):
-                                if isinstance(obj, dict):
-                                    for k, v in obj.items():
-                                        if isinstance(k, str) and k.startswith("nfl.g.") and isinstance(v, dict):
-                                            if "start_time" in v:
-                                                game_times[k] = v["start_time"]
-                                        extract_game_times(v)
-                                elif isinstance(obj, list):
-                                    for item in obj:
-                                        extract_game_times(item)
-                            
-                            extract_game_times(data)
-                        except json.JSONDecodeError:
-                            pass
-    except Exception as e:
-        print(f"Error parsing JSON: {e}")
-        pass
-
-    current_week_num = get_current_week()
-    print(f"Current Week: {current_week_num}")
-
-    with Session(engine) as session:
-        # Find or create Week
-        # We assume the season is 2025 based on the prompt context
-        season = 2025
-        week = session.exec(select(Week).where(Week.season == season, Week.week_number == current_week_num)).first()
-        if not week:
-            # If week doesn't exist, create it with dummy dates for now or calculate them
-            # Start date = Sept 2 + (week-1)*7 days
-            week_start = datetime(2025, 9, 2) + timedelta(weeks=current_week_num - 1)
-            week_end = week_start + timedelta(days=6)
-            week = Week(
-                season=season,
-                week_number=current_week_num,
-                start_date=week_start.strftime("%Y-%m-%d"),
-                end_date=week_end.strftime("%Y-%m-%d")
-            )
-            session.add(week)
-            session.commit()
-            session.refresh(week)
-            print(f"Created Week {current_week_num}")
-        else:
-            print(f"Found Week {current_week_num}")
-
-        # Find all game items
-        game_items = soup.find_all("li", {"data-tst": re.compile(r"^GameItem-")})
-
-        for item in game_items:
-            try:
-                # Game ID
-                game_id_str = item.get("data-tst", "").replace("GameItem-", "")
-                
-                # Teams
-                team_items = item.find_all("li", class_="team")
-                if len(team_items) < 2:
-                    continue
-
-                # Away Team
-                away_team_item = team_items[0]
-                away_city = away_team_item.find("span", {"data-tst": "first-name"})
-                away_name = away_team_item.find("span", {"data-tst": "last-name"})
-                if away_city and away_name:
-                    away_team_name = f"{away_city.get_text(strip=True)} {away_name.get_text(strip=True)}"
-                else:
-                    continue # Skip if name not found
-
-                # Home Team
-                home_team_item = team_items[1]
-                home_city = home_team_item.find("span", {"data-tst": "first-name"})
-                home_name = home_team_item.find("span", {"data-tst": "last-name"})
-                if home_city and home_name:
-                    home_team_name = f"{home_city.get_text(strip=True)} {home_name.get_text(strip=True)}"
-                else:
-                    continue # Skip if name not found
-
-                # Find Teams in DB
-                away_team = session.exec(select(Team).where(Team.name == away_team_name)).first()
-                home_team = session.exec(select(Team).where(Team.name == home_team_name)).first()
-
-                if not away_team:
-                    print(f"Warning: Away team '{away_team_name}' not found in DB.")
-                    continue
-                if not home_team:
-                    print(f"Warning: Home team '{home_team_name}' not found in DB.")
-                    continue
-
-                # Odds / Spread
-                spread = 0.0
-                odds_div = item.find("div", class_="odds", title=True)
-                if odds_div and "total" not in odds_div.get("class", []):
-                    raw_odds = odds_div.get_text(strip=True)
-                    # Extract number: "-5" or "+3.5"
-                    odds_match = re.search(r"([+-]?\d+(\.\d+)?)", raw_odds.split()[-1])
-                    if odds_match:
-                        try:
-                            spread = float(odds_match.group(1))
-                        except ValueError:
-                            pass
-
-                # Over/Under
-                over_under = None
-                ou_div = item.select_one("div.odds.total")
-                if ou_div:
-                    raw_ou = ou_div.get_text(strip=True)
-                    ou_match = re.search(r"(\d+(\.\d+)?)", raw_ou)
-                    if ou_match:
-                        try:
-                            over_under = float(ou_match.group(1))
-                        except ValueError:
-                            pass
-
-                # Game Time
-                game_time_str = None
-                if game_id_str in game_times:
-                    game_time_str = game_times[game_id_str]
-
-                # Find existing game or create new
-                # We match on week, home_team, away_team
-                game = session.exec(select(Game).where(
-                    Game.week_id == week.id,
-                    Game.home_team_id == home_team.id,
-                    Game.away_team_id == away_team.id
-                )).first()
-
-                if not game:
-                    game = Game(
-                        week_id=week.id,
-                        home_team_id=home_team.id,
-                        away_team_id=away_team.id,
-                        spread=spread,
-                        over_under=over_under,
-                        game_time=game_time_str,
-                        status="scheduled"
-                    )
-                    session.add(game)
-                    print(f"Added game: {away_team.name} @ {home_team.name}")
-                else:
-                    # Update existing game
-                    game.spread = spread
-                    game.over_under = over_under
-                    game.game_time = game_time_str
-                    session.add(game)
-                    print(f"Updated game: {away_team.name} @ {home_team.name}")
-
-            except Exception as e:
-                print(f"Error processing game item: {e}")
-                continue
-        
-        session.commit()
+        if page.sha256 == page_cache.ingested(url) and not force:
+            print("Scoreboard unchanged since it was last ingested; nothing to do (use --force to re-ingest)")
+            return
+        print("Fetched a new scoreboard snapshot" if page.changed else "Ingesting a snapshot that wasn't ingested yet")
+
+    if ingest_pages([page.content]):
+        page_cache.mark_ingested(url, page.sha256)
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+def week_url(url: str, season: int, week_number: int) -> str:
+    # schedState=2 is the regular season
+    return f"{url}?{urlencode({'confId': '', 'dateRange': week_number, 'schedState': 2, 'season': season})}"
+
+def is_week_over(content: bytes) -> bool:
+    games = parse_scoreboard(content)
+    return bool(games) and all(g.status == "final" for g in games)
+
+async def fetch_weeks(
+    url: str, season: int, week_numbers: List[int], concurrency: int, rate: float, refresh: bool, offline: bool, force: bool
+) -> List[Tuple[str, FetchResult]]:
+    """
+    Return the (url, page) pairs to ingest: pages not ingested yet (new,
+    changed, or left over from a failed run), plus every cached one when
+    offline or forced.
+    """
+    pages: Dict[int, FetchResult] = {}
+    for week_number in week_numbers:
+        cached = cached_page(week_url(url, season, week_number))
+        # Weeks that are over never change, so they aren't even revalidated
+        if cached is not None and (offline or (not refresh and is_week_over(cached.content))):
+            pages[week_number] = cached
+    missing = [] if offline else [w for w in week_numbers if w not in pages]
+    print(f"Season {season}: {len(pages)} week(s) cached, requesting {len(missing)}")
+
+    limiter = RateLimiter(rate)
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(headers=REQUEST_HEADERS, limits=limits, timeout=30, follow_redirects=True) as client:
+        async def fetch(week_number: int):
+            async with semaphore:
+                await limiter.wait()
+                try:
+                    result = await page_cache.fetch_async(client, week_url(url, season, week_number))
+                except httpx.HTTPError as e:
+                    print(f"Error fetching week {week_number}: {e}")
+                    return
+            pages[week_number] = result
+
+        await asyncio.gather(*(fetch(w) for w in missing))
+
+    if missing:
+        changed = sum(1 for w in missing if w in pages and pages[w].changed)
+        print(f"{changed} new or changed page(s), {len(missing) - changed} unchanged")
+    week_pages = [(week_url(url, season, w), pages[w]) for w in week_numbers if w in pages]
+    if not (offline or force):
+        # Skip what an earlier run already committed
+        week_pages = [(page_url, page) for page_url, page in week_pages if page.sha256 != page_cache.ingested(page_url)]
+    return week_pages
+
+def parse_week_range(value: str) -> List[int]:
+    # "5" or "1-18"
+    first, _, last = value.partition("-")
+    return list(range(int(first), int(last or first) + 1))
+
+def backfill(url: str, season: int, week_numbers: List[int], concurrency: int, rate: float, refresh: bool, offline: bool, force: bool):
+    started = time.perf_counter()
+    pages = asyncio.run(fetch_weeks(url, season, week_numbers, concurrency, rate, refresh, offline, force))
+    if pages and ingest_pages([page.content for _, page in pages]):
+        for page_url, page in pages:
+            page_cache.mark_ingested(page_url, page.sha256)
+    print(f"Backfilled {len(pages)} week(s) in {time.perf_counter() - started:.1f}s")
 
 if __name__ == "__main__":
-    scrape_yahoo_nfl()
-
+    parser = argparse.ArgumentParser(description="Scrape the Yahoo NFL scoreboard, or backfill a season's weeks.")
+    parser.add_argument("--season", type=int, help="Backfill this season instead of scraping the current week")
+    parser.add_argument("--weeks", default="1-18", help="Week range to backfill, e.g. 1-18 or 7")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum parallel requests")
+    parser.add_argument("--rate", type=float, default=2, help="Maximum requests started per second")
+    parser.add_argument("--refresh", action="store_true", help="Revalidate cached weeks even if they are over")
+    parser.add_argument("--offline", action="store_true", help="Ingest the latest cached snapshots without any requests")
+    parser.add_argument("--force", action="store_true", help="Ingest pages even if they haven't changed since they were last fetched")
+    parser.add_argument("--url", default=SCOREBOARD_URL, help="Scoreboard URL for backfills (e.g. a local fixture server)")
+    args = parser.parse_args()
+
+    if args.season:
+        backfill(args.url, args.season, parse_week_range(args.weeks), args.concurrency, args.rate, args.refresh, args.offline, args.force)
+    else:
+        scrape_yahoo_nfl(offline=args.offline, force=args.force)
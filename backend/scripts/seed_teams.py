@@ -7,6 +7,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from app.database import engine
 from app.models import Team
+from app.teams import team_registry
+from app.versions import bump_team_version
 
 teams_data = [
     {"abbreviation": "ari", "name": "Arizona Cardinals"},
@@ -45,19 +47,35 @@ teams_data = [
 
 def seed_teams():
     with Session(engine) as session:
+        changed = False
         for team_data in teams_data:
+            logo_path = f"/logos/{team_data['abbreviation']}.svg"
             team = session.exec(select(Team).where(Team.abbreviation == team_data["abbreviation"])).first()
             if not team:
                 team = Team(
                     name=team_data["name"],
                     abbreviation=team_data["abbreviation"],
-                    logo_path=f"/logos/{team_data['abbreviation']}.svg"
+                    logo_path=logo_path
                 )
                 session.add(team)
+                changed = True
                 print(f"Added {team.name}")
+            elif (team.name, team.logo_path) != (team_data["name"], logo_path):
+                team.name = team_data["name"]
+                team.logo_path = logo_path
+                session.add(team)
+                changed = True
+                print(f"Updated {team.name}")
             else:
-                print(f"Skipped {team.name} (already exists)")
+                print(f"Skipped {team.name} (already up to date)")
+        if changed:
+            # The API reloads its team registry (and moves the games ETags
+            # on) when it sees the new version
+            bump_team_version(session)
         session.commit()
 
+    # Drop cached teams so this process sees the new rows
+    team_registry.invalidate()
+
 if __name__ == "__main__":
     seed_teams()
@@ -1,13 +1,14 @@
 import sys
 import os
 from sqlmodel import Session, select
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 # Add parent directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from app.database import engine
-from app.models import Week, Game, Team
+from app.models import Week, Game
+from app.teams import team_registry
 
 def seed_weeks_and_games():
     with Session(engine) as session:
@@ -26,10 +27,10 @@ def seed_weeks_and_games():
             print("Added Week 1")
         
         # Get some teams
-        chiefs = session.exec(select(Team).where(Team.abbreviation == "kc")).first()
-        ravens = session.exec(select(Team).where(Team.abbreviation == "bal")).first()
-        eagles = session.exec(select(Team).where(Team.abbreviation == "phi")).first()
-        packers = session.exec(select(Team).where(Team.abbreviation == "gb")).first()
+        chiefs = team_registry.by_abbreviation(session, "kc")
+        ravens = team_registry.by_abbreviation(session, "bal")
+        eagles = team_registry.by_abbreviation(session, "phi")
+        packers = team_registry.by_abbreviation(session, "gb")
         
         if chiefs and ravens:
             # Create Game 1: Chiefs vs Ravens
@@ -41,7 +42,7 @@ def seed_weeks_and_games():
                     away_team_id=ravens.id,
                     spread=-3.5, # Chiefs favored by 3.5
                     status="scheduled",
-                    game_time="2024-09-05T20:20:00",
+                    game_time=datetime(2024, 9, 5, 20, 20, tzinfo=timezone.utc),
                     over_under=46.5
                 )
                 session.add(game1)
@@ -57,7 +58,7 @@ def seed_weeks_and_games():
                     away_team_id=packers.id,
                     spread=-2.5,
                     status="scheduled",
-                    game_time="2024-09-06T20:15:00",
+                    game_time=datetime(2024, 9, 6, 20, 15, tzinfo=timezone.utc),
                     over_under=48.5
                 )
                 session.add(game2)
@@ -0,0 +1,34 @@
+import sys
+import os
+import argparse
+from sqlmodel import Session, select
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.database import engine
+from app.models import Game
+from app.standings import update_game_result
+
+def update_score(game_id: int, home_score: int, away_score: int, status: str):
+    with Session(engine) as session:
+        # Locked until commit, so concurrent writers don't grade the same change twice
+        game = session.exec(select(Game).where(Game.id == game_id).with_for_update()).first()
+        if not game:
+            print(f"Game {game_id} not found!")
+            return
+
+        changed = update_game_result(session, game, home_score, away_score, status)
+        session.commit()
+        print(f"Game {game_id}: {away_score} @ {home_score} ({status})")
+        if changed:
+            print("Standings updated")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Set a game's score and status, updating standings incrementally.")
+    parser.add_argument("game_id", type=int)
+    parser.add_argument("home_score", type=int)
+    parser.add_argument("away_score", type=int)
+    parser.add_argument("--status", default="final", choices=["scheduled", "in_progress", "final"])
+    args = parser.parse_args()
+    update_score(args.game_id, args.home_score, args.away_score, args.status)
@@ -6,7 +6,8 @@ from sqlmodel import Session, select
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from app.database import engine
-from app.models import Game, Week, Team
+from app.models import Game, Week
+from app.teams import team_registry
 
 def verify_games():
     with Session(engine) as session:
@@ -23,8 +24,8 @@ def verify_games():
         print(f"Found {len(games)} games for Week 12")
         
         for game in games:
-            home_team = session.get(Team, game.home_team_id)
-            away_team = session.get(Team, game.away_team_id)
+            home_team = team_registry.get(session, game.home_team_id)
+            away_team = team_registry.get(session, game.away_team_id)
             print(f"{away_team.name} @ {home_team.name} | Spread: {game.spread} | O/U: {game.over_under} | Time: {game.game_time}")
 
 if __name__ == "__main__":
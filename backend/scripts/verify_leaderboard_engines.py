@@ -0,0 +1,142 @@
+import sys
+import os
+import argparse
+import random
+from datetime import datetime
+from sqlmodel import Session, select
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.database import engine
+from app.models import User, Team, Week, Game, Pick, Standing
+from app.leaderboard import compute_leaderboard, compute_leaderboard_sql, read_standings_leaderboard
+from app.standings import compute_standings
+
+# Engines checked against the Python grading path
+ENGINES = {"sql": compute_leaderboard_sql, "standings": read_standings_leaderboard}
+
+def generate_dataset(session: Session, users: int, weeks: int, seed: int):
+    # Synthetic season written inside the caller's transaction
+    rng = random.Random(seed)
+    team_ids = list(session.exec(select(Team.id)).all())
+    if len(team_ids) < 2:
+        raise SystemExit("Seed teams first: python scripts/seed_teams.py")
+
+    stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    new_users = [User(email=f"parity-{stamp}-{i}@example.com", name=f"Parity User {i}") for i in range(users)]
+    session.add_all(new_users)
+
+    new_weeks = [
+        Week(season=1900, week_number=n + 1, start_date="1900-01-01", end_date="1900-01-07")
+        for n in range(weeks)
+    ]
+    session.add_all(new_weeks)
+    session.flush()
+
+    games = []
+    for week in new_weeks:
+        rng.shuffle(team_ids)
+        for home_id, away_id in zip(team_ids[0::2], team_ids[1::2]):
+            status = rng.choice(["final", "final", "final", "in_progress", "scheduled"])
+            has_score = status != "scheduled" and rng.random() > 0.05
+            games.append(Game(
+                week_id=week.id,
+                home_team_id=home_id,
+                away_team_id=away_id,
+                spread=rng.choice([-7.5, -6.5, -3.0, -2.5, -1.0, 0.0, 1.5, 3.0, 4.5, 7.0]),
+                home_score=rng.randint(0, 42) if has_score else None,
+                away_score=rng.randint(0, 42) if has_score else None,
+                status=status
+            ))
+    session.add_all(games)
+    session.flush()
+
+    for user in new_users:
+        for game in games:
+            if rng.random() < 0.85:
+                # Picks made before the line moved are graded at their own
+                # line; some land on whole numbers the game line doesn't
+                locked = rng.random()
+                if locked < 0.4:
+                    spread = None
+                elif locked < 0.6:
+                    spread = game.spread
+                else:
+                    spread = game.spread + rng.choice([-3.0, -1.5, -1.0, -0.5, 0.5, 1.0, 1.5, 3.0])
+                session.add(Pick(
+                    user_id=user.id,
+                    game_id=game.id,
+                    selected_team_id=rng.choice([game.home_team_id, game.away_team_id]),
+                    spread=spread
+                ))
+    session.flush()
+
+    # Standings for the new weeks, as update_game_result would have kept them
+    week_ids = {w.id for w in new_weeks}
+    for (user_id, week_id), (correct, total, pushes) in compute_standings(session).items():
+        if week_id in week_ids:
+            session.add(Standing(user_id=user_id, week_id=week_id, correct=correct, total=total, pushes=pushes))
+    session.flush()
+    return [w.id for w in new_weeks]
+
+def compare(session: Session, week_id: int | None, season: int | None = None) -> bool:
+    expected = compute_leaderboard(session, week_id=week_id, season=season)
+    scope = f"Week id {week_id}" if week_id else f"Season {season}" if season else "Overall"
+    return all([
+        compare_engine(f"{scope} ({name})", expected, engine(session, week_id=week_id, season=season))
+        for name, engine in ENGINES.items()
+    ])
+
+def compare_engine(label: str, expected, actual) -> bool:
+    expected_map = {e.user_id: e for e in expected}
+    actual_map = {e.user_id: e for e in actual}
+    problems = []
+    if set(expected_map) != set(actual_map):
+        problems.append(f"user sets differ ({len(expected_map)} vs {len(actual_map)})")
+
+    for user_id in set(expected_map) & set(actual_map):
+        e, a = expected_map[user_id], actual_map[user_id]
+        if (e.correct_picks, e.total_picks) != (a.correct_picks, a.total_picks):
+            problems.append(f"user {user_id}: {e.correct_picks}/{e.total_picks} vs {a.correct_picks}/{a.total_picks}")
+        # Postgres rounds halves away from zero and Python to even, so allow one step
+        elif abs(e.win_rate - a.win_rate) > 0.1 + 1e-9:
+            problems.append(f"user {user_id}: win rate {e.win_rate} vs {a.win_rate}")
+
+    # Both engines use competition ranking with ties listed by user id
+    if [(e.user_id, e.rank) for e in expected] != [(a.user_id, a.rank) for a in actual] and not problems:
+        problems.append("ranking differs")
+
+    if problems:
+        print(f"MISMATCH {label}:")
+        for problem in problems[:20]:
+            print(f"  {problem}")
+        return False
+
+    print(f"OK {label}: {len(actual)} entries")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the SQL and standings leaderboard engines against the Python grading path.")
+    parser.add_argument("--generate", action="store_true", help="Compare on a generated dataset (rolled back afterwards)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--weeks", type=int, default=18)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        if args.generate:
+            week_ids = generate_dataset(session, args.users, args.weeks, args.seed)
+        else:
+            week_ids = list(session.exec(select(Week.id)).all())
+
+        seasons = session.exec(select(Week.season).where(Week.id.in_(week_ids)).distinct()).all()
+        ok = all([compare(session, week_id) for week_id in [None] + week_ids])
+        ok = all([compare(session, None, season) for season in seasons]) and ok
+        session.rollback()
+
+    if not ok:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
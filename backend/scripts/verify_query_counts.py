@@ -0,0 +1,100 @@
+import sys
+import os
+import argparse
+import asyncio
+from sqlalchemy import event
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+import httpx
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.database import async_engine, get_async_session
+from app.main import app
+from app.models import Team, Week, Game
+from app.teams import team_registry
+from app.versions import data_versions
+
+def generate_weeks(session: Session, sizes):
+    # Synthetic weeks written inside the caller's transaction
+    team_ids = list(session.exec(select(Team.id).order_by(Team.id)).all())
+    if len(team_ids) < 2 * max(sizes):
+        raise SystemExit(f"Need {2 * max(sizes)} teams: python scripts/seed_teams.py")
+
+    weeks = [
+        Week(season=1900, week_number=n + 1, start_date="1900-01-01", end_date="1900-01-07")
+        for n in range(len(sizes))
+    ]
+    session.add_all(weeks)
+    session.flush()
+    for week, size in zip(weeks, sizes):
+        session.add_all([
+            Game(week_id=week.id, home_team_id=home_id, away_team_id=away_id, spread=-3.0, status="scheduled")
+            for home_id, away_id in zip(team_ids[0:2 * size:2], team_ids[1:2 * size:2])
+        ])
+    session.flush()
+    return [w.id for w in weeks]
+
+async def count_statements(client: httpx.AsyncClient, week_id: int, statements: list) -> int:
+    statements.clear()
+    response = await client.get(f"/weeks/{week_id}/games")
+    response.raise_for_status()
+    return len(statements)
+
+async def run(sizes) -> bool:
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async with async_engine.connect() as conn:
+        trans = await conn.begin()
+        # Everything the endpoint reads goes through this session, so the
+        # generated weeks are visible and rolled back afterwards
+        session = AsyncSession(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint")
+        week_ids = await session.run_sync(generate_weeks, sizes)
+
+        async def override():
+            yield session
+
+        app.dependency_overrides[get_async_session] = override
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                cold, warm = {}, {}
+                for size, week_id in zip(sizes, week_ids):
+                    data_versions.invalidate()
+                    team_registry.invalidate()
+                    cold[size] = await count_statements(client, week_id, statements)
+                    warm[size] = await count_statements(client, week_id, statements)
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+            app.dependency_overrides.pop(get_async_session, None)
+            await session.close()
+            await trans.rollback()
+    await async_engine.dispose()
+
+    ok = True
+    for label, counts in (("cold caches", cold), ("warm caches", warm)):
+        print(f"{label}: " + ", ".join(f"{size} games -> {n} statements" for size, n in counts.items()))
+        if len(set(counts.values())) != 1:
+            print(f"FAIL {label}: statement count grows with the number of games")
+            ok = False
+    # With the version snapshot and team registry loaded, a week is one select
+    if max(warm.values()) != 1:
+        print(f"FAIL warm caches: expected 1 statement per request")
+        ok = False
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that /weeks/{id}/games runs a constant number of statements per request.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16], help="Games per generated week")
+    args = parser.parse_args()
+
+    if not asyncio.run(run(args.sizes)):
+        sys.exit(1)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
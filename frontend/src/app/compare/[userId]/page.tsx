@@ -3,7 +3,7 @@
 import { useState, useEffect } from 'react';
 import { useAuth } from '@/context/AuthContext';
 import { fetchAPI } from '@/lib/api';
-import { Week, Game, Pick } from '@/types';
+import { Week, Comparison } from '@/types';
 import ComparisonCard from '@/components/ComparisonCard';
 import { useParams } from 'next/navigation';
 
@@ -14,9 +14,7 @@ export default function ComparisonPage() {
 
 
     const [selectedWeek, setSelectedWeek] = useState<Week | null>(null);
-    const [games, setGames] = useState<Game[]>([]);
-    const [myPicks, setMyPicks] = useState<Pick[]>([]);
-    const [theirPicks, setTheirPicks] = useState<Pick[]>([]);
+    const [comparison, setComparison] = useState<Comparison | null>(null);
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
@@ -39,14 +37,12 @@ export default function ComparisonPage() {
         const loadData = async () => {
             setLoading(true);
             try {
-                const [gamesData, myPicksData, theirPicksData] = await Promise.all([
-                    fetchAPI(`/weeks/${selectedWeek.id}/games`),
-                    fetchAPI('/picks/me', { headers: { Authorization: `Bearer ${token}` } }),
-                    fetchAPI(`/picks/user/${targetUserId}`, { headers: { Authorization: `Bearer ${token}` } })
-                ]);
-                setGames(gamesData);
-                setMyPicks(myPicksData);
-                setTheirPicks(theirPicksData);
+                // Paired per game on the server; their picks stay hidden until kickoff
+                const data: Comparison = await fetchAPI(
+                    `/picks/compare?week_id=${selectedWeek.id}&other_user_id=${targetUserId}`,
+                    { headers: { Authorization: `Bearer ${token}` } }
+                );
+                setComparison(data);
             } catch (error) {
                 console.error('Failed to load comparison data', error);
             } finally {
@@ -71,15 +67,19 @@ export default function ComparisonPage() {
                     )}
                 </div>
 
+                {!loading && comparison && (
+                    <div className="text-sm text-center text-gray-500 mb-4">
+                        Agreed on {comparison.agreed} of {comparison.agreed + comparison.disagreed} games
+                    </div>
+                )}
+
                 {loading ? (
                     <div className="text-center py-8">Loading...</div>
                 ) : (
-                    games.map(game => (
+                    comparison?.games.map(entry => (
                         <ComparisonCard
-                            key={game.id}
-                            game={game}
-                            myPick={myPicks.find(p => p.game_id === game.id)}
-                            theirPick={theirPicks.find(p => p.game_id === game.id)}
+                            key={entry.game.id}
+                            entry={entry}
                             theirName={`User ${targetUserId}`} // Ideally fetch user name too
                         />
                     ))
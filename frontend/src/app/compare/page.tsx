@@ -3,7 +3,7 @@
 import { useState, useEffect } from 'react';
 import { useAuth } from '@/context/AuthContext';
 import { fetchAPI } from '@/lib/api';
-import { Week, Game, Pick, User } from '@/types';
+import { Week, Comparison, User } from '@/types';
 import ComparisonCard from '@/components/ComparisonCard';
 
 export default function ComparePage() {
@@ -13,9 +13,7 @@ export default function ComparePage() {
     const [usersWithPicks, setUsersWithPicks] = useState<User[]>([]);
     const [selectedOpponentId, setSelectedOpponentId] = useState<number | null>(null);
 
-    const [games, setGames] = useState<Game[]>([]);
-    const [myPicks, setMyPicks] = useState<Pick[]>([]);
-    const [theirPicks, setTheirPicks] = useState<Pick[]>([]);
+    const [comparison, setComparison] = useState<Comparison | null>(null);
     const [loading, setLoading] = useState(true);
 
     // Load weeks
@@ -63,14 +61,12 @@ export default function ComparePage() {
         const loadData = async () => {
             setLoading(true);
             try {
-                const [gamesData, myPicksData, theirPicksData] = await Promise.all([
-                    fetchAPI(`/weeks/${selectedWeek.id}/games`),
-                    fetchAPI('/picks/me', { headers: { Authorization: `Bearer ${token}` } }),
-                    fetchAPI(`/picks/user/${selectedOpponentId}`, { headers: { Authorization: `Bearer ${token}` } })
-                ]);
-                setGames(gamesData);
-                setMyPicks(myPicksData);
-                setTheirPicks(theirPicksData);
+                // Paired per game on the server; their picks stay hidden until kickoff
+                const data: Comparison = await fetchAPI(
+                    `/picks/compare?week_id=${selectedWeek.id}&other_user_id=${selectedOpponentId}`,
+                    { headers: { Authorization: `Bearer ${token}` } }
+                );
+                setComparison(data);
             } catch (error) {
                 console.error('Failed to load comparison data', error);
             } finally {
@@ -108,21 +104,25 @@ export default function ComparePage() {
                     </select>
                 </div>
 
+                {!loading && comparison && (
+                    <div className="text-sm text-center text-gray-500 mb-4">
+                        Agreed on {comparison.agreed} of {comparison.agreed + comparison.disagreed} games
+                    </div>
+                )}
+
                 {loading ? (
                     <div className="text-center py-8">Loading...</div>
                 ) : (
-                    games.map(game => (
+                    comparison?.games.map(entry => (
                         <ComparisonCard
-                            key={game.id}
-                            game={game}
-                            myPick={myPicks.find(p => p.game_id === game.id)}
-                            theirPick={theirPicks.find(p => p.game_id === game.id)}
+                            key={entry.game.id}
+                            entry={entry}
                             theirName={selectedOpponent ? selectedOpponent.name.split(' ')[0] : 'Opponent'}
                         />
                     ))
                 )}
 
-                {!loading && games.length === 0 && (
+                {!loading && comparison?.games.length === 0 && (
                     <div className="text-center py-8 text-gray-500">No games found for this week.</div>
                 )}
             </div>
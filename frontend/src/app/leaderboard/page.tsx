@@ -1,24 +1,41 @@
 'use client';
 
 import { useState, useEffect } from 'react';
+import { useAuth } from '@/context/AuthContext';
 import { fetchAPI } from '@/lib/api';
-import { Week, LeaderboardEntry } from '@/types';
+import { Week, LeaderboardEntry, LeaderboardPage as Page } from '@/types';
+
+const PAGE_SIZE = 25;
 
 export default function LeaderboardPage() {
+    const { token } = useAuth();
     const [leaderboard, setLeaderboard] = useState<LeaderboardEntry[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [me, setMe] = useState<LeaderboardEntry | null>(null);
     const [currentWeek, setCurrentWeek] = useState<Week | null>(null);
     const [loading, setLoading] = useState(true);
 
+    const loadPage = async (season: number, cursor?: string) => {
+        const params = new URLSearchParams({ season: String(season), limit: String(PAGE_SIZE) });
+        if (cursor) params.set('cursor', cursor);
+        const page: Page = await fetchAPI(`/leaderboard/page?${params}`, {
+            headers: { Authorization: `Bearer ${token}` }
+        });
+        setLeaderboard(prev => cursor ? [...prev, ...page.entries] : page.entries);
+        setNextCursor(page.next_cursor ?? null);
+        setMe(page.me ?? null);
+    };
+
     useEffect(() => {
+        if (!token) return;
+
         const loadData = async () => {
             try {
-                const [leaderboardData, weeksData] = await Promise.all([
-                    fetchAPI('/leaderboard'),
-                    fetchAPI('/weeks')
-                ]);
-                setLeaderboard(leaderboardData);
+                const weeksData: Week[] = await fetchAPI('/weeks');
                 if (weeksData.length > 0) {
                     setCurrentWeek(weeksData[0]);
+                    // The current season's board, a page at a time
+                    await loadPage(weeksData[0].season);
                 }
             } catch (error) {
                 console.error('Failed to load data', error);
@@ -27,7 +44,18 @@ export default function LeaderboardPage() {
             }
         };
         loadData();
-    }, []);
+    }, [token]);
+
+    const loadMore = async () => {
+        if (!currentWeek || !nextCursor) return;
+        try {
+            await loadPage(currentWeek.season, nextCursor);
+        } catch (error) {
+            console.error('Failed to load more', error);
+        }
+    };
+
+    if (!token) return <div className="p-8">Please login.</div>;
 
     if (loading) {
         return <div className="p-8 text-center">Loading leaderboard...</div>;
@@ -43,6 +71,13 @@ export default function LeaderboardPage() {
                 )}
             </div>
 
+            {me && (
+                <div className="mb-4 p-3 rounded-xl bg-blue-50 dark:bg-blue-900/20 text-sm flex justify-between">
+                    <span className="font-medium">Your rank: #{me.rank}</span>
+                    <span className="text-gray-500">{me.correct_picks}/{me.total_picks} ({me.win_rate}%)</span>
+                </div>
+            )}
+
             <div className="bg-white dark:bg-gray-800 rounded-xl shadow-sm overflow-hidden">
                 <table className="w-full">
                     <thead className="bg-gray-50 dark:bg-gray-700/50 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">
@@ -94,6 +129,14 @@ export default function LeaderboardPage() {
                         )}
                     </tbody>
                 </table>
+                {nextCursor && (
+                    <button
+                        onClick={loadMore}
+                        className="w-full py-3 text-sm text-blue-600 hover:underline border-t border-gray-200 dark:border-gray-700"
+                    >
+                        Load more
+                    </button>
+                )}
             </div>
         </main>
     );
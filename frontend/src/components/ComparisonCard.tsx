@@ -1,15 +1,18 @@
-import { Game, Pick, Team } from '@/types';
+import { ComparedGame, PickResult, Team } from '@/types';
 import Image from 'next/image';
 import clsx from 'clsx';
 
 interface ComparisonCardProps {
-    game: Game;
-    myPick?: Pick;
-    theirPick?: Pick;
+    entry: ComparedGame;
     theirName: string;
 }
 
-export default function ComparisonCard({ game, myPick, theirPick, theirName }: ComparisonCardProps) {
+const RESULT_LABELS: Record<PickResult, string> = { win: 'Won', loss: 'Lost', push: 'Push' };
+
+export default function ComparisonCard({ entry, theirName }: ComparisonCardProps) {
+    const { game } = entry;
+    const teamFor = (teamId: number) => teamId === game.home_team.id ? game.home_team : game.away_team;
+
     const TeamDisplay = ({ team, isPicked, label }: { team: Team, isPicked: boolean, label: string }) => (
         <div className={clsx(
             "flex flex-col items-center p-2 rounded-lg border-2 w-full",
@@ -40,11 +43,11 @@ export default function ComparisonCard({ game, myPick, theirPick, theirName }: C
                 {/* My Pick Column */}
                 <div className="flex flex-col items-center border-r border-gray-100 dark:border-gray-700 pr-4">
                     <span className="text-xs font-medium mb-2 text-gray-500">You</span>
-                    {myPick ? (
+                    {entry.my_pick ? (
                         <TeamDisplay
-                            team={myPick.selected_team_id === game.home_team.id ? game.home_team : game.away_team}
+                            team={teamFor(entry.my_pick)}
                             isPicked={true}
-                            label="Picked"
+                            label={entry.my_result ? RESULT_LABELS[entry.my_result] : 'Picked'}
                         />
                     ) : (
                         <span className="text-xs text-gray-400 italic">Skipped</span>
@@ -54,12 +57,14 @@ export default function ComparisonCard({ game, myPick, theirPick, theirName }: C
                 {/* Their Pick Column */}
                 <div className="flex flex-col items-center pl-4">
                     <span className="text-xs font-medium mb-2 text-gray-500">{theirName}</span>
-                    {theirPick ? (
+                    {entry.their_pick ? (
                         <TeamDisplay
-                            team={theirPick.selected_team_id === game.home_team.id ? game.home_team : game.away_team}
+                            team={teamFor(entry.their_pick)}
                             isPicked={true}
-                            label="Picked"
+                            label={entry.their_result ? RESULT_LABELS[entry.their_result] : 'Picked'}
                         />
+                    ) : entry.their_pick_hidden ? (
+                        <span className="text-xs text-gray-400 italic">Hidden until kickoff</span>
                     ) : (
                         <span className="text-xs text-gray-400 italic">Skipped</span>
                     )}
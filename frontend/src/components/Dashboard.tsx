@@ -2,8 +2,8 @@
 
 import { useState, useEffect } from 'react';
 import { useAuth } from '@/context/AuthContext';
-import { fetchAPI } from '@/lib/api';
-import { Week, Game, Pick } from '@/types';
+import { API_URL, fetchAPI } from '@/lib/api';
+import { Week, Game, GameUpdate, Pick } from '@/types';
 import GameCard from './GameCard';
 
 export default function Dashboard() {
@@ -49,6 +49,21 @@ export default function Dashboard() {
         loadData();
     }, [selectedWeek, token]);
 
+    // Scores and statuses are pushed as they change instead of re-polling
+    useEffect(() => {
+        if (!selectedWeek) return;
+
+        const source = new EventSource(`${API_URL}/weeks/${selectedWeek.id}/live`);
+        source.addEventListener('games', (event) => {
+            const updates: GameUpdate[] = JSON.parse((event as MessageEvent).data).games;
+            setGames(prev => prev.map(game => {
+                const update = updates.find(u => u.id === game.id);
+                return update ? { ...game, ...update } : game;
+            }));
+        });
+        return () => source.close();
+    }, [selectedWeek]);
+
     const handlePick = async (gameId: number, teamId: number) => {
         if (!token) return;
 
@@ -26,6 +26,14 @@ export interface Game {
     over_under?: number;
 }
 
+export interface GameUpdate {
+    id: number;
+    home_score?: number;
+    away_score?: number;
+    status: string;
+    spread: number;
+}
+
 export interface Pick {
     id: number;
     user_id: number;
@@ -33,6 +41,34 @@ export interface Pick {
     selected_team_id: number;
 }
 
+export type PickResult = 'win' | 'loss' | 'push';
+
+export interface ComparedGame {
+    game: Game;
+    locked: boolean;
+    my_pick?: number;
+    their_pick?: number;
+    their_pick_hidden: boolean;
+    my_result?: PickResult;
+    their_result?: PickResult;
+}
+
+export interface PickRecord {
+    wins: number;
+    losses: number;
+    pushes: number;
+}
+
+export interface Comparison {
+    week_id: number;
+    other_user_id: number;
+    games: ComparedGame[];
+    agreed: number;
+    disagreed: number;
+    my_record: PickRecord;
+    their_record: PickRecord;
+}
+
 export interface LeaderboardEntry {
     rank: number;
     user_id: number;
@@ -43,6 +79,13 @@ export interface LeaderboardEntry {
     win_rate: number;
 }
 
+export interface LeaderboardPage {
+    entries: LeaderboardEntry[];
+    next_cursor?: string | null;
+    total: number;
+    me?: LeaderboardEntry | null;
+}
+
 export interface User {
     id: number;
     email: string;